@@ -0,0 +1,298 @@
+import asyncio
+import collections
+import weakref
+from enum import Enum
+from typing import Dict, List
+
+from WeatherStation import *
+
+
+# Async dispatch
+class QueuePolicy(Enum):
+    BLOCK = 1  # producer awaits until the observer catches up
+    DROP_OLDEST = 2  # discard the oldest pending snapshot
+    COALESCE = 3  # overwrite the newest pending snapshot with the latest one
+
+
+class ObserverQueue(asyncio.Queue):
+    """Bounded per-observer queue of (snapshot, is_batch) items."""
+
+    policy: QueuePolicy
+    dropped: int
+    coalesced: int
+
+    def __init__(self, maxsize: int, policy: QueuePolicy):
+        super().__init__(maxsize)
+        self.policy = policy
+        self.dropped = 0
+        self.coalesced = 0
+
+    # asyncio.Queue's documented extension hooks; we own the deque so we can
+    # overwrite its tail when coalescing.
+    def _init(self, maxsize):
+        self._queue = collections.deque()
+
+    def _get(self):
+        return self._queue.popleft()
+
+    def _put(self, item):
+        self._queue.append(item)
+
+    def offer(self, item) -> bool:
+        """Enqueue without waiting. Returns False only for a full BLOCK queue."""
+        if not self.full():
+            self.put_nowait(item)
+        elif self.policy == QueuePolicy.DROP_OLDEST:
+            self.get_nowait()
+            self.task_done()
+            self.dropped += 1
+            self.put_nowait(item)
+        elif self.policy == QueuePolicy.COALESCE:
+            self._queue[-1] = item
+            self.coalesced += 1
+        else:
+            return False
+        return True
+
+
+class AsyncWeatherData(WeatherData):
+    """WeatherData that hands each observer its own queue and consumer task.
+
+    The producer only snapshots the measurements and enqueues them, so a slow
+    observer delays nobody but itself. Must be used from inside a running
+    event loop; call start() before publishing and stop() to drain and shut
+    down. An observer whose update raises keeps receiving later updates;
+    the exceptions are collected and raised together by stop().
+    """
+
+    _queues: "weakref.WeakKeyDictionary[Observer, ObserverQueue]"
+    _tasks: "weakref.WeakKeyDictionary[Observer, asyncio.Task]"
+    _offload: "weakref.WeakKeyDictionary[Observer, bool]"
+    _maxsize: int
+    _policy: QueuePolicy
+    _running: bool
+    _errors: List[Exception]
+
+    def __init__(self, maxsize: int = 64, policy: QueuePolicy = QueuePolicy.BLOCK):
+        super().__init__()
+        self._queues = weakref.WeakKeyDictionary()
+        self._tasks = weakref.WeakKeyDictionary()
+        self._offload = weakref.WeakKeyDictionary()
+        self._maxsize = maxsize
+        self._policy = policy
+        self._running = False
+        self._errors = []
+
+    def register_observer(
+        self,
+        observer: "Observer",
+        maxsize: int = None,
+        policy: QueuePolicy = None,
+        offload: bool = False,
+    ):
+        """Register with an optional per-observer queue size and policy.
+
+        Set offload for observers whose update() blocks (console or network
+        I/O) so it runs in a worker thread instead of stalling the loop.
+        """
+        if observer in self._queues:
+            raise ValueError(
+                "Observer is already registered; use set_policy to change its queue"
+            )
+        super().register_observer(observer)
+        self._queues[observer] = self._make_queue(maxsize, policy)
+        self._offload[observer] = offload
+        if self._running:
+            self._start_consumer(observer)
+
+    async def set_policy(
+        self,
+        observer: "Observer",
+        maxsize: int = None,
+        policy: QueuePolicy = None,
+        offload: bool = False,
+    ):
+        """Give a registered observer a new queue size, policy or offload.
+
+        Displays register themselves in __init__, so this is how one gets
+        its own queue. Updates already queued for it are delivered first.
+        """
+        old = self._queues[observer]
+        task = self._tasks.get(observer)
+        if task is not None:
+            await old.join()
+
+        queue = self._queues[observer] = self._make_queue(maxsize, policy)
+        queue.dropped = old.dropped
+        queue.coalesced = old.coalesced
+        self._offload[observer] = offload
+        if task is None:
+            # No consumer yet, so carry anything published before start()
+            while not old.empty():
+                item = old.get_nowait()
+                old.task_done()
+                if not queue.offer(item):
+                    queue.dropped += 1
+            return
+
+        task.cancel()
+        self._start_consumer(observer)
+        await asyncio.gather(task, return_exceptions=True)
+
+    def remove_observer(self, observer: "Observer"):
+        super().remove_observer(observer)
+        task = self._tasks.pop(observer, None)
+        if task is not None:
+            task.cancel()
+        del self._queues[observer]
+        del self._offload[observer]
+
+    def start(self):
+        self._running = True
+        for obs in self.observers:
+            if obs not in self._tasks:
+                self._start_consumer(obs)
+
+    async def drain(self):
+        await asyncio.gather(*(q.join() for q in self._queues.values()))
+
+    async def stop(self):
+        await self.drain()
+        self._running = False
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+
+        errors, self._errors = self._errors, []
+        if errors:
+            raise ExceptionGroup("Observer updates failed", errors)
+
+    def get_errors(self) -> List[Exception]:
+        """Exceptions raised by observer updates since the last stop()."""
+        return list(self._errors)
+
+    def _make_queue(self, maxsize: int, policy: QueuePolicy) -> ObserverQueue:
+        return ObserverQueue(
+            self._maxsize if maxsize is None else maxsize,
+            self._policy if policy is None else policy,
+        )
+
+    def _start_consumer(self, observer: "Observer"):
+        # The consumer holds its observer weakly, and is cancelled once the
+        # observer is collected rather than waiting on its queue forever
+        loop = asyncio.get_running_loop()
+        task = None
+
+        def on_collect(_):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(task.cancel)
+
+        task = self._tasks[observer] = loop.create_task(
+            self._consume(
+                weakref.ref(observer, on_collect),
+                self._queues[observer],
+                self._offload[observer],
+            )
+        )
+
+    async def _consume(self, ref: weakref.ref, queue: ObserverQueue, offload: bool):
+        while True:
+            snapshot, batch = await queue.get()
+            observer = ref()
+            try:
+                if observer is None:
+                    return
+                if offload:
+                    await asyncio.to_thread(observer.update_from, snapshot, batch)
+                else:
+                    observer.update_from(snapshot, batch)
+            except Exception as e:
+                # One bad update must not kill the consumer, or its queue is
+                # never drained and drain()/stop() wait forever
+                e.add_note(f"while updating {observer!r}")
+                self._errors.append(e)
+            finally:
+                queue.task_done()
+                # Not kept alive while waiting for the next item
+                observer = None
+
+    # Producer side
+    def notify_observers(self):
+        self._enqueue((self.snapshot(), False))
+
+    def notify_observers_batch(self):
+        self._enqueue((self.snapshot(), True))
+
+    # The sync setters check for room before storing anything, so a rejected
+    # update leaves the measurements, their dirty fields and the store as
+    # they were
+    def set_measurements(self, temp_f: float, pressure: float, humidity: float):
+        self._check_capacity()
+        super().set_measurements(temp_f, pressure, humidity)
+
+    def set_measurements_batch(self, temps, pressures, humidities, timestamps=None):
+        self._check_capacity()
+        super().set_measurements_batch(temps, pressures, humidities, timestamps)
+
+    def _check_capacity(self):
+        # Every queue is checked, so a full BLOCK queue rejects the update
+        # for all observers rather than for those after it
+        for obs in self.observers:
+            queue = self._queues[obs]
+            if queue.policy == QueuePolicy.BLOCK and queue.full():
+                raise asyncio.QueueFull(
+                    "Observer queue is full; use the *_async setters with BLOCK policy"
+                )
+
+    def _enqueue(self, item):
+        self._check_capacity()
+        for obs in self.observers:
+            self._queues[obs].offer(item)
+
+    async def _enqueue_async(self, item):
+        for obs in self.observers:
+            queue = self._queues[obs]
+            if not queue.offer(item):
+                await queue.put(item)
+
+    async def set_measurements_async(
+        self, temp_f: float, pressure: float, humidity: float
+    ):
+        self._store_measurements(temp_f, pressure, humidity)
+
+        await self._enqueue_async((self.snapshot(), False))
+        self.notify_field_subscribers()
+
+    async def set_measurements_batch_async(
+        self, temps, pressures, humidities, timestamps=None
+    ):
+        if self._store_measurements_batch(temps, pressures, humidities, timestamps):
+            await self._enqueue_async((self.snapshot(), True))
+            self.notify_field_subscribers()
+
+    def get_queue_stats(self) -> Dict["Observer", dict]:
+        return {
+            obs: {
+                "pending": q.qsize(),
+                "dropped": q.dropped,
+                "coalesced": q.coalesced,
+            }
+            for obs, q in self._queues.items()
+        }
+
+
+if __name__ == "__main__":
+
+    async def main():
+        wd = AsyncWeatherData(maxsize=2, policy=QueuePolicy.COALESCE)
+        current_conditions_display = CurrentConditionsDisplay(wd)
+        statistics_display = StatisticsDisplay(wd)
+        wd.start()
+
+        for temp in range(70, 80):
+            wd.set_measurements(temp, 30.0, 60)
+        await wd.stop()
+        print(wd.get_queue_stats())
+
+    asyncio.run(main())
@@ -0,0 +1,162 @@
+import argparse
+import contextlib
+import datetime
+import gc
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+from WeatherStation import *
+
+# Benchmark for WeatherData.set_measurements -> notify_observers -> update
+#
+# Every case registers `observers` displays of one type, pushes synthetic
+# samples in blocks of `batch_size` (1 means scalar set_measurements), and
+# optionally paces them at `rate` samples/s. Output is JSON so runs can be
+# diffed over time.
+
+DISPLAYS = {
+    "current_conditions": CurrentConditionsDisplay,
+    "statistics": StatisticsDisplay,
+    "forecast": ForecastDisplay,
+    "heat_index": HeatIndexDisplay,
+}
+
+
+def make_samples(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    temps = rng.uniform(60, 100, n)
+    pressures = 30 + np.cumsum(rng.normal(0, 0.001, n))
+    humidities = rng.uniform(20, 95, n)
+    return temps, pressures, humidities
+
+
+def build(display: str, observers: int):
+    wd = WeatherData()
+    # Keep strong references; the subject only holds weak ones
+    displays = [DISPLAYS[display](wd) for _ in range(observers)]
+    return wd, displays
+
+
+def push(wd: "WeatherData", samples, batch_size: int, rate: float) -> np.ndarray:
+    """Publish every sample; returns per-call latencies in seconds."""
+    temps, pressures, humidities = samples
+    calls = range(0, temps.size, batch_size)
+    latencies = np.empty(len(calls))
+    start = time.perf_counter()
+    for k, i in enumerate(calls):
+        if rate > 0:
+            due = start + i / rate
+            while time.perf_counter() < due:
+                pass
+        t0 = time.perf_counter()
+        if batch_size == 1:
+            wd.set_measurements(temps[i], pressures[i], humidities[i])
+        else:
+            j = i + batch_size
+            wd.set_measurements_batch(temps[i:j], pressures[i:j], humidities[i:j])
+        latencies[k] = time.perf_counter() - t0
+    return latencies
+
+
+def run_case(
+    display: str, observers: int, batch_size: int, rate: float, samples: int
+) -> dict:
+    data = make_samples(samples)
+
+    # Timing pass; displays print, so swallow stdout rather than the work
+    wd, displays = build(display, observers)
+    gc.collect()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        latencies = push(wd, data, batch_size, rate)
+        elapsed = time.perf_counter() - start
+    del wd, displays
+
+    # Memory pass; tracemalloc skews timings, so it runs separately
+    gc.collect()
+    tracemalloc.start()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        wd, displays = build(display, observers)
+        push(wd, data, batch_size, 0)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del wd, displays
+
+    per_sample = latencies / min(batch_size, samples)
+    return {
+        "display": display,
+        "observers": observers,
+        "batch_size": batch_size,
+        "target_rate": rate,
+        "samples": samples,
+        "elapsed_seconds": elapsed,
+        "samples_per_second": samples / elapsed,
+        "observer_updates_per_second": samples * observers / elapsed,
+        "call_latency_seconds": _percentiles(latencies),
+        "per_sample_latency_seconds": _percentiles(per_sample),
+        "peak_memory_bytes": peak,
+    }
+
+
+def _percentiles(xs: np.ndarray) -> dict:
+    p50, p90, p99, p999 = np.percentile(xs, (50, 90, 99, 99.9))
+    return {"p50": p50, "p90": p90, "p99": p99, "p99.9": p999, "max": float(xs.max())}
+
+
+def _int_list(s: str):
+    return [int(x) for x in s.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the observer subsystem")
+    parser.add_argument("--displays", default=",".join(DISPLAYS))
+    parser.add_argument(
+        "--observers", type=_int_list, default=[1, 10, 100, 1000, 10000, 100000]
+    )
+    parser.add_argument("--batch-sizes", type=_int_list, default=[1, 100, 10000])
+    parser.add_argument(
+        "--rates", type=_int_list, default=[0], help="samples/s, 0 = unpaced"
+    )
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=200000,
+        help="observer updates per case; samples = max(batch size, budget / observers)",
+    )
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    results = []
+    for display in args.displays.split(","):
+        for observers in args.observers:
+            for batch_size in args.batch_sizes:
+                for rate in args.rates:
+                    samples = max(batch_size, args.budget // observers)
+                    results.append(
+                        run_case(display, observers, batch_size, rate, samples)
+                    )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
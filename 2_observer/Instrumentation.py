@@ -0,0 +1,144 @@
+import math
+import os
+import tempfile
+import time
+import weakref
+from typing import Dict, List
+
+import numpy as np
+
+
+# Observer instrumentation
+class ObserverTiming:
+    """Call count, total time and a log2 latency histogram for one observer.
+
+    Bucket i counts calls that took at most BASE * 2**i seconds (and more
+    than the bucket before); calls slower than the last bound are only
+    counted in overflow.
+    """
+
+    BASE = 1e-6
+    BUCKETS = 25  # 1us .. ~16.8s
+
+    name: str
+    count: int
+    total: float
+    buckets: List[int]
+    overflow: int
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * self.BUCKETS
+        self.overflow = 0
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        exponent = 0
+        if seconds > self.BASE:
+            # frexp gives the binary exponent without a log call; exact
+            # powers of two belong to the bucket they bound
+            mantissa, exponent = math.frexp(seconds / self.BASE)
+            if mantissa == 0.5:
+                exponent -= 1
+        if exponent < self.BUCKETS:
+            self.buckets[exponent] += 1
+        else:
+            self.overflow += 1
+
+    @classmethod
+    def bounds(cls) -> List[float]:
+        return [cls.BASE * 2**i for i in range(cls.BUCKETS)]
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile; NaN if empty.
+
+        Quantiles that fall among the overflow calls have no finite bound,
+        so they are reported as infinity.
+        """
+        if self.count == 0:
+            return math.nan
+        rank = max(1, math.ceil(q * self.count))
+        i = int(np.searchsorted(np.cumsum(self.buckets), rank))
+        return self.bounds()[i] if i < self.BUCKETS else math.inf
+
+
+class ObserverMetrics:
+    """Per-observer timings collected by WeatherData.notify_observers.
+
+    Observers are labelled by class name and first-timed order number,
+    e.g. "StatisticsDisplay#1". Timings are held weakly by observer, like
+    the registry, so a collected observer's timing goes with it.
+    """
+
+    _timings: "weakref.WeakKeyDictionary[object, ObserverTiming]"
+    _numbered: int
+    _clock = staticmethod(time.perf_counter)
+
+    def __init__(self):
+        self.reset()
+
+    def timing_for(self, observer) -> ObserverTiming:
+        timing = self._timings.get(observer)
+        if timing is None:
+            timing = self._timings[observer] = ObserverTiming(
+                f"{type(observer).__name__}#{self._numbered}"
+            )
+            self._numbered += 1
+        return timing
+
+    def call(self, observer, method):
+        timing = self.timing_for(observer)
+        start = self._clock()
+        try:
+            method()
+        finally:
+            timing.record(self._clock() - start)
+
+    def reset(self):
+        self._timings = weakref.WeakKeyDictionary()
+        self._numbered = 0
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {
+            t.name: {
+                "count": t.count,
+                "total_seconds": t.total,
+                "mean_seconds": t.total / t.count if t.count else math.nan,
+                "p50_seconds": t.percentile(0.5),
+                "p99_seconds": t.percentile(0.99),
+                "buckets": {
+                    **dict(zip(ObserverTiming.bounds(), t.buckets)),
+                    math.inf: t.overflow,
+                },
+            }
+            for t in list(self._timings.values())
+        }
+
+    def to_prometheus(self, metric: str = "weather_observer_update_seconds") -> str:
+        lines = [
+            f"# HELP {metric} Time spent in observer update calls.",
+            f"# TYPE {metric} histogram",
+        ]
+        bounds = ObserverTiming.bounds()
+        for t in list(self._timings.values()):
+            label = f'observer="{t.name}"'
+            cumulative = 0
+            for bound, n in zip(bounds, t.buckets):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{{label},le="{bound!r}"}} {cumulative}')
+            # Overflow calls only show up here, so every finite le is exact
+            lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {t.count}')
+            lines.append(f"{metric}_sum{{{label}}} {t.total!r}")
+            lines.append(f"{metric}_count{{{label}}} {t.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Write the text exposition atomically, for a node_exporter textfile collector."""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".prom.tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
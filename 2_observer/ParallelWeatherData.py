@@ -0,0 +1,203 @@
+import collections
+import weakref
+from abc import abstractmethod
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from enum import Enum
+from typing import Deque, Dict
+
+import numpy as np
+from WeatherStation import *
+
+
+# Executor-backed dispatch
+class DispatchMode(Enum):
+    INLINE = 1  # on the producer's thread, as WeatherData does
+    THREAD = 2
+    PROCESS = 3
+
+
+class ProcessObserver(MeasurementsObserver):
+    """Observer that splits its update into a pure compute step and an apply step.
+
+    compute() runs in a worker process and only receives a Measurements
+    snapshot, so neither the observer nor the WeatherData is pickled. Its
+    return value is handed back to apply() in the parent, in publish order.
+    It must be a staticmethod (or module-level function) so it pickles by name.
+    """
+
+    @staticmethod
+    @abstractmethod
+    def compute(source: "Measurements", batch: bool):
+        raise NotImplementedError
+
+    @abstractmethod
+    def apply(self, result):
+        raise NotImplementedError
+
+    def update_from(self, source: "Measurements", batch: bool = False):
+        self.apply(self.compute(source, batch))
+
+
+class ParallelWeatherData(WeatherData):
+    """WeatherData that fans updates out to thread and process pools.
+
+    Each observer is tagged with a DispatchMode at registration. With
+    barrier=True (the default) notify_observers waits for every observer to
+    finish before returning, so the next measurement can't overtake it.
+    Without the barrier, updates to any one observer still run in order.
+    """
+
+    _modes: Dict["Observer", DispatchMode]
+    _pending: Dict["Observer", Deque[Future]]
+    _barrier: bool
+    _max_workers: int
+    _thread_pool: ThreadPoolExecutor = None
+    _process_pool: ProcessPoolExecutor = None
+
+    def __init__(self, max_workers: int = None, barrier: bool = True):
+        super().__init__()
+        self._modes = weakref.WeakKeyDictionary()
+        self._pending = weakref.WeakKeyDictionary()
+        self._max_workers = max_workers
+        self._barrier = barrier
+
+    def register_observer(
+        self, observer: "Observer", mode: DispatchMode = DispatchMode.INLINE
+    ):
+        if mode == DispatchMode.PROCESS and not isinstance(observer, ProcessObserver):
+            raise TypeError(
+                "Only ProcessObserver instances can run in the process pool"
+            )
+        # A fresh deque would drop the futures still in flight for it
+        if observer in self._pending:
+            raise ValueError(
+                "Observer is already registered; use set_mode to change its mode"
+            )
+        super().register_observer(observer)
+        self._modes[observer] = mode
+        self._pending[observer] = collections.deque()
+
+    def remove_observer(self, observer: "Observer"):
+        self._flush(observer, block=True)
+        super().remove_observer(observer)
+        del self._modes[observer]
+        del self._pending[observer]
+
+    def set_mode(self, observer: "Observer", mode: DispatchMode):
+        # Displays register themselves in __init__, so retagging is the usual
+        # way to move one onto a pool.
+        if mode == DispatchMode.PROCESS and not isinstance(observer, ProcessObserver):
+            raise TypeError(
+                "Only ProcessObserver instances can run in the process pool"
+            )
+        self._flush(observer, block=True)
+        self._modes[observer] = mode
+
+    def notify_observers(self):
+        self._dispatch(False)
+
+    def notify_observers_batch(self):
+        self._dispatch(True)
+
+    def wait(self):
+        """Block until every outstanding update has finished and been applied."""
+        for obs in self.observers:
+            self._flush(obs, block=True)
+
+    def shutdown(self):
+        self.wait()
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown()
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+
+    def _dispatch(self, batch: bool):
+        snapshot = self.snapshot()
+        for obs in self.observers:
+            mode = self._modes[obs]
+            pending = self._pending[obs]
+            if mode == DispatchMode.INLINE:
+                if batch:
+                    obs.update_batch()
+                else:
+                    obs.update()
+            elif mode == DispatchMode.THREAD:
+                previous = pending[-1] if pending else None
+                pending.append(
+                    self._get_thread_pool().submit(
+                        _run_after, previous, obs.update_from, snapshot, batch
+                    )
+                )
+            else:
+                pending.append(
+                    self._get_process_pool().submit(type(obs).compute, snapshot, batch)
+                )
+            # Apply whatever has already finished so pending stays short
+            self._flush(obs, block=False)
+
+        if self._barrier:
+            self.wait()
+
+    def _flush(self, observer: "Observer", block: bool):
+        pending = self._pending[observer]
+        while pending and (block or pending[0].done()):
+            result = pending.popleft().result()
+            if self._modes[observer] == DispatchMode.PROCESS:
+                observer.apply(result)
+
+    def _get_thread_pool(self) -> Executor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(self._max_workers)
+        return self._thread_pool
+
+    def _get_process_pool(self) -> Executor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(self._max_workers)
+        return self._process_pool
+
+
+def _run_after(previous: Future, fn, *args):
+    # Keeps one observer's thread-pool updates in order without a barrier.
+    # The previous future was submitted first, so it is never queued behind us.
+    if previous is not None:
+        wait([previous])
+    return fn(*args)
+
+
+# Displays
+class ParallelHeatIndexDisplay(HeatIndexDisplay, ProcessObserver):
+    @staticmethod
+    def compute(source: "Measurements", batch: bool):
+        if batch:
+            return heat_index(source.get_temps(), source.get_humidities())
+        return np.array(
+            [heat_index(source.get_temp(), source.get_humidity())], dtype=float
+        )
+
+    def apply(self, result):
+        self._set_heat_indexes(result)
+        self.display()
+
+    update_from = ProcessObserver.update_from
+
+
+if __name__ == "__main__":
+    wd = ParallelWeatherData()
+
+    current_conditions_display = CurrentConditionsDisplay(wd)
+    statistics_display = StatisticsDisplay(wd)
+    heat_index_display = ParallelHeatIndexDisplay(wd)
+    wd.set_mode(statistics_display, DispatchMode.THREAD)
+    wd.set_mode(heat_index_display, DispatchMode.PROCESS)
+
+    wd.set_measurements(80, 30.4, 65)
+    wd.set_measurements_batch([80, 81, 83], [30.1, 30.0, 29.8], [60, 65, 72])
+    wd.shutdown()
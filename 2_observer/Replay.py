@@ -0,0 +1,141 @@
+import argparse
+import itertools
+import time
+from typing import Iterator, Tuple
+
+import numpy as np
+from WeatherStation import *
+
+# Replay pipeline
+#
+# Logs are read as blocks of (timestamps, temps, pressures, humidities)
+# arrays. CSV logs have those four columns (an optional header line is
+# skipped); binary logs are packed little-endian float64 records in the
+# same order.
+
+Block = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+RECORD_DTYPE = np.dtype("<f8")
+RECORD_FIELDS = 4
+
+
+def read_csv_blocks(path: str, chunk_size: int = 65536) -> Iterator[Block]:
+    with open(path) as f:
+        first = f.readline()
+        if not first:
+            return
+        lines = f if _is_header(first) else itertools.chain([first], f)
+        while True:
+            chunk = list(itertools.islice(lines, chunk_size))
+            if not chunk:
+                return
+            # A chunk of nothing but blank lines has no rows (and makes
+            # loadtxt warn); the scan stops at the first non-blank line
+            if not any(line.strip() for line in chunk):
+                continue
+            data = np.loadtxt(chunk, delimiter=",", ndmin=2)
+            if data.size == 0:
+                continue
+            yield data[:, 0], data[:, 1], data[:, 2], data[:, 3]
+
+
+def _is_header(line: str) -> bool:
+    try:
+        float(line.split(",", 1)[0])
+    except ValueError:
+        return bool(line.strip())
+    return False
+
+
+def read_binary_blocks(path: str, chunk_size: int = 65536) -> Iterator[Block]:
+    record_bytes = RECORD_DTYPE.itemsize * RECORD_FIELDS
+    with open(path, "rb") as f:
+        while True:
+            buf = f.read(record_bytes * chunk_size)
+            if not buf:
+                return
+            if len(buf) % record_bytes:
+                raise ValueError(f"{path} ends with a partial record")
+            data = np.frombuffer(buf, dtype=RECORD_DTYPE).reshape(-1, RECORD_FIELDS)
+            yield data[:, 0], data[:, 1], data[:, 2], data[:, 3]
+
+
+def write_binary_records(path: str, timestamps, temps, pressures, humidities):
+    data = np.column_stack((timestamps, temps, pressures, humidities)).astype(
+        RECORD_DTYPE
+    )
+    with open(path, "ab") as f:
+        f.write(data.tobytes())
+
+
+def paced(blocks: Iterator[Block], speed: float = 1.0) -> Iterator[Block]:
+    """Re-slice blocks so each record is released at its data time.
+
+    Data time is mapped onto the wall clock from the first record, scaled by
+    `speed` (2.0 replays twice as fast). Everything due by now goes out as
+    one block, so pacing never degrades to one call per record.
+    """
+    start_wall = None
+    start_data = None
+    for ts, temps, pressures, humidities in blocks:
+        if start_wall is None and ts.size:
+            start_wall = time.monotonic()
+            start_data = ts[0]
+
+        i = 0
+        while i < ts.size:
+            due = start_data + (time.monotonic() - start_wall) * speed
+            j = int(np.searchsorted(ts, due, side="right"))
+            if j <= i:
+                time.sleep(min((ts[i] - due) / speed, 1.0))
+                continue
+            yield ts[i:j], temps[i:j], pressures[i:j], humidities[i:j]
+            i = j
+
+
+def replay(wd: "WeatherData", blocks: Iterator[Block]) -> int:
+    """Feed blocks into wd, one batch update per block. Returns records sent."""
+    records = 0
+    batch = hasattr(wd, "set_measurements_batch")
+    for ts, temps, pressures, humidities in blocks:
+        if batch:
+            wd.set_measurements_batch(temps, pressures, humidities, timestamps=ts)
+        else:
+            for t, p, h in zip(temps, pressures, humidities):
+                wd.set_measurements(t, p, h)
+        records += ts.size
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a sensor log into WeatherData")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=("csv", "binary"), default=None)
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument(
+        "--realtime", action="store_true", help="pace records by their timestamps"
+    )
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="pacing speed-up for --realtime"
+    )
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "binary")
+    reader = read_csv_blocks if fmt == "csv" else read_binary_blocks
+    blocks = reader(args.path, args.chunk_size)
+    if args.realtime:
+        blocks = paced(blocks, args.speed)
+
+    wd = WeatherData()
+    statistics_display = StatisticsDisplay(wd)
+    forecast_display = ForecastDisplay(wd)
+
+    start = time.perf_counter()
+    records = replay(wd, blocks)
+    elapsed = time.perf_counter() - start
+    rate = records / elapsed if elapsed > 0 else float("inf")
+    print(f"Replayed {records} records in {elapsed:.3f}s ({rate:,.0f} records/s)")
+
+
+if __name__ == "__main__":
+    main()
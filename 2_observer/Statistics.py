@@ -0,0 +1,474 @@
+import math
+from typing import Dict
+
+import numpy as np
+
+
+# Streaming statistics
+class RunningStatistics:
+    """Constant-space count/mean/variance/min/max over a stream of samples.
+
+    Mean and variance use Welford's update, and batches are folded in with
+    Chan's parallel combination so a block costs one vectorized pass. If
+    `window` is non-zero, the last `window` samples are also kept in a
+    fixed-size ring buffer.
+    """
+
+    count: int
+    mean: float
+    _m2: float
+    min: float
+    max: float
+    _window: np.ndarray
+    _window_size: int
+    _window_pos: int
+    _window_len: int
+
+    def __init__(self, window: int = 0):
+        if window < 0:
+            raise ValueError("window must be non-negative")
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+        self._window_size = window
+        self._window = np.empty(window, dtype=float)
+        self._window_pos = 0
+        self._window_len = 0
+
+    def add(self, x: float):
+        x = float(x)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+        if self._window_size:
+            self._window[self._window_pos] = x
+            self._window_pos = (self._window_pos + 1) % self._window_size
+            self._window_len = min(self._window_len + 1, self._window_size)
+
+    def add_batch(self, xs):
+        xs = np.asarray(xs, dtype=float).ravel()
+        n = xs.size
+        if n == 0:
+            return
+
+        batch_mean = float(xs.mean())
+        batch_m2 = float(((xs - batch_mean) ** 2).sum())
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(xs.min()))
+        self.max = max(self.max, float(xs.max()))
+
+        if self._window_size:
+            self._push_window(xs)
+
+    def _push_window(self, xs: np.ndarray):
+        size = self._window_size
+        if xs.size >= size:
+            self._window[:] = xs[-size:]
+            self._window_pos = 0
+            self._window_len = size
+            return
+
+        end = self._window_pos + xs.size
+        if end <= size:
+            self._window[self._window_pos : end] = xs
+        else:
+            split = size - self._window_pos
+            self._window[self._window_pos :] = xs[:split]
+            self._window[: end - size] = xs[split:]
+        self._window_pos = end % size
+        self._window_len = min(self._window_len + xs.size, size)
+
+    def variance(self) -> float:
+        # Population variance, matching np.var's default
+        if self.count == 0:
+            return math.nan
+        return self._m2 / self.count
+
+    def std(self) -> float:
+        return math.sqrt(self.variance())
+
+    def get_window(self) -> np.ndarray:
+        """Return the buffered samples, oldest first."""
+        if self._window_len < self._window_size:
+            return self._window[: self._window_len].copy()
+        return np.roll(self._window, -self._window_pos)
+
+
+# Windowed quantiles
+class HistogramSketch:
+    """Fixed-bin histogram over [lo, hi) used as a mergeable quantile sketch.
+
+    Memory is one int64 per bin no matter how many samples are added, two
+    sketches with the same bins merge by adding counts, and quantiles are
+    accurate to half a bin width. Values outside the range land in the
+    first or last bin.
+    """
+
+    lo: float
+    hi: float
+    bins: int
+    counts: np.ndarray
+
+    def __init__(self, lo: float, hi: float, bins: int):
+        if hi <= lo or bins <= 0:
+            raise ValueError("Sketch needs hi > lo and a positive bin count")
+        self.lo = lo
+        self.hi = hi
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def bin_of(self, xs) -> np.ndarray:
+        scaled = (np.asarray(xs, dtype=float) - self.lo) * (
+            self.bins / (self.hi - self.lo)
+        )
+        return np.clip(scaled.astype(np.int64), 0, self.bins - 1)
+
+    def add_batch(self, xs):
+        self.counts += np.bincount(self.bin_of(xs).ravel(), minlength=self.bins)
+
+    def merge(self, other: "HistogramSketch"):
+        self.counts += other.counts
+
+    def quantiles(self, qs) -> np.ndarray:
+        return histogram_quantiles(self.counts, self.lo, self.hi, qs)
+
+
+def histogram_quantiles(counts: np.ndarray, lo: float, hi: float, qs) -> np.ndarray:
+    """Quantiles (bin midpoints) of a histogram over [lo, hi); NaN if empty."""
+    qs = np.asarray(qs, dtype=float)
+    cumulative = np.cumsum(counts)
+    total = cumulative[-1] if cumulative.size else 0
+    if total == 0:
+        return np.full(qs.shape, np.nan)
+    ranks = np.maximum(np.ceil(qs * total), 1)
+    idx = np.searchsorted(cumulative, ranks, side="left")
+    width = (hi - lo) / counts.size
+    return lo + (idx + 0.5) * width
+
+
+class SlidingWindow:
+    """Time-bucketed partial aggregates for one window span.
+
+    The span is split into `span / bucket_width` buckets held in a ring.
+    Each bucket keeps count/sum/min/max and a histogram, and is recycled
+    when time moves past it. A query merges the live buckets, so its cost
+    depends on the bucket and bin counts, never on the number of samples.
+    """
+
+    span: float
+    bucket_width: float
+    _sketch: HistogramSketch
+    _ids: np.ndarray
+    _count: np.ndarray
+    _sum: np.ndarray
+    _min: np.ndarray
+    _max: np.ndarray
+    _hist: np.ndarray
+
+    def __init__(
+        self, span: float, bucket_width: float, lo: float, hi: float, bins: int
+    ):
+        n = int(math.ceil(span / bucket_width))
+        self.span = span
+        self.bucket_width = bucket_width
+        self._sketch = HistogramSketch(lo, hi, bins)
+        self._ids = np.full(n, -1, dtype=np.int64)
+        self._count = np.zeros(n, dtype=np.int64)
+        self._sum = np.zeros(n)
+        self._min = np.full(n, math.inf)
+        self._max = np.full(n, -math.inf)
+        # int32 halves the dominant memory cost; a bucket would need 2**31
+        # samples in one bin to overflow
+        self._hist = np.zeros((n, bins), dtype=np.int32)
+
+    def add_batch(self, timestamps, xs):
+        timestamps = np.asarray(timestamps, dtype=float).ravel()
+        xs = np.asarray(xs, dtype=float).ravel()
+        if xs.size == 0:
+            return
+
+        n = self._ids.size
+        bucket_ids = (timestamps // self.bucket_width).astype(np.int64)
+        # Drop samples already older than the ring can hold
+        keep = bucket_ids > bucket_ids.max() - n
+        bucket_ids, xs = bucket_ids[keep], xs[keep]
+        slots = bucket_ids % n
+
+        # Recycle slots whose bucket has rotated out, newest id wins
+        newest = np.full(n, -1, dtype=np.int64)
+        np.maximum.at(newest, slots, bucket_ids)
+        stale = newest > self._ids
+        self._ids[stale] = newest[stale]
+        self._count[stale] = 0
+        self._sum[stale] = 0.0
+        self._min[stale] = math.inf
+        self._max[stale] = -math.inf
+        self._hist[stale] = 0
+
+        live = self._ids[slots] == bucket_ids
+        slots, xs = slots[live], xs[live]
+        np.add.at(self._count, slots, 1)
+        np.add.at(self._sum, slots, xs)
+        np.minimum.at(self._min, slots, xs)
+        np.maximum.at(self._max, slots, xs)
+        np.add.at(self._hist, (slots, self._sketch.bin_of(xs)), np.int32(1))
+
+    def add(self, timestamp: float, x: float):
+        # Scalar twin of add_batch; ufunc.at is slow for one element
+        bucket_id = int(timestamp // self.bucket_width)
+        slot = bucket_id % self._ids.size
+        if self._ids[slot] > bucket_id:
+            return
+        if self._ids[slot] < bucket_id:
+            self._ids[slot] = bucket_id
+            self._count[slot] = 0
+            self._sum[slot] = 0.0
+            self._min[slot] = math.inf
+            self._max[slot] = -math.inf
+            self._hist[slot] = 0
+
+        x = float(x)
+        self._count[slot] += 1
+        self._sum[slot] += x
+        if x < self._min[slot]:
+            self._min[slot] = x
+        if x > self._max[slot]:
+            self._max[slot] = x
+        self._hist[slot, self._sketch.bin_of(x)] += 1
+
+    def _live(self, now: float) -> np.ndarray:
+        current = int(now // self.bucket_width)
+        return (self._ids > current - self._ids.size) & (self._ids <= current)
+
+    def summary(self, now: float, qs=(0.5, 0.95, 0.99)) -> dict:
+        live = self._live(now)
+        count = int(self._count[live].sum())
+        quantiles = histogram_quantiles(
+            self._hist[live].sum(axis=0), self._sketch.lo, self._sketch.hi, qs
+        )
+        return {
+            "count": count,
+            "mean": float(self._sum[live].sum() / count) if count else math.nan,
+            "min": float(self._min[live].min()) if count else math.nan,
+            "max": float(self._max[live].max()) if count else math.nan,
+            **{f"p{round(q * 100):g}": float(v) for q, v in zip(qs, quantiles)},
+        }
+
+
+class WindowedStatistics:
+    """One variable's sliding windows, e.g. 5 minutes, 1 hour and 24 hours.
+
+    `windows` maps a window name to (span, bucket_width) in seconds. Longer
+    windows use coarser buckets so each ring stays small.
+    """
+
+    DEFAULT_WINDOWS = {
+        "5m": (300, 10),
+        "1h": (3600, 60),
+        "24h": (86400, 900),
+    }
+
+    windows: Dict[str, SlidingWindow]
+
+    def __init__(
+        self, lo: float, hi: float, bins: int = 180, windows: Dict[str, tuple] = None
+    ):
+        if windows is None:
+            windows = self.DEFAULT_WINDOWS
+        self.windows = {
+            name: SlidingWindow(span, width, lo, hi, bins)
+            for name, (span, width) in windows.items()
+        }
+
+    def add(self, timestamp: float, x: float):
+        for window in self.windows.values():
+            window.add(timestamp, x)
+
+    def add_batch(self, timestamps, xs):
+        for window in self.windows.values():
+            window.add_batch(timestamps, xs)
+
+    def summary(self, now: float, qs=(0.5, 0.95, 0.99)) -> Dict[str, dict]:
+        return {name: window.summary(now, qs) for name, window in self.windows.items()}
+
+
+# Trend fitting
+class RollingLinearFit:
+    """Least-squares line through the last `window` (t, y) samples.
+
+    Keeps running sums of t, y, t*t and t*y, adding the new sample and
+    subtracting the evicted one, so each update is O(1). Times are stored
+    relative to a reference that is moved to the oldest sample once per
+    `window` updates; the sums are rebuilt then, which keeps them well
+    conditioned and costs O(1) amortized.
+    """
+
+    _size: int
+    _t: np.ndarray
+    _y: np.ndarray
+    _pos: int
+    _len: int
+    _t0: float
+    _since_rebase: int
+    _st: float
+    _sy: float
+    _stt: float
+    _sty: float
+
+    def __init__(self, window: int):
+        if window < 2:
+            raise ValueError("window must hold at least two samples")
+        self._size = window
+        self._t = np.empty(window)
+        self._y = np.empty(window)
+        self._pos = 0
+        self._len = 0
+        self._t0 = None
+        self._since_rebase = 0
+        self._st = self._sy = self._stt = self._sty = 0.0
+
+    def add(self, t: float, y: float):
+        if self._t0 is None:
+            self._t0 = t
+        t = float(t) - self._t0
+        y = float(y)
+
+        if self._len == self._size:
+            old_t = self._t[self._pos]
+            old_y = self._y[self._pos]
+            self._st -= old_t
+            self._sy -= old_y
+            self._stt -= old_t * old_t
+            self._sty -= old_t * old_y
+        else:
+            self._len += 1
+
+        self._t[self._pos] = t
+        self._y[self._pos] = y
+        self._st += t
+        self._sy += y
+        self._stt += t * t
+        self._sty += t * y
+        self._pos = (self._pos + 1) % self._size
+
+        self._since_rebase += 1
+        if self._since_rebase >= self._size:
+            self._rebase()
+
+    def add_batch(self, ts, ys):
+        ts = np.asarray(ts, dtype=float).ravel()
+        ys = np.asarray(ys, dtype=float).ravel()
+        if ts.size < self._size:
+            for t, y in zip(ts, ys):
+                self.add(t, y)
+            return
+
+        # The batch replaces the whole window, so load it in one go
+        if self._t0 is None:
+            self._t0 = ts[0]
+        self._t[:] = ts[-self._size :] - self._t0
+        self._y[:] = ys[-self._size :]
+        self._pos = 0
+        self._len = self._size
+        self._rebase()
+
+    def _rebase(self):
+        t = self._t[: self._len]
+        y = self._y[: self._len]
+        oldest = self._t[self._pos] if self._len == self._size else self._t[0]
+        t -= oldest
+        self._t0 += oldest
+        self._st = float(t.sum())
+        self._sy = float(y.sum())
+        self._stt = float(t @ t)
+        self._sty = float(t @ y)
+        self._since_rebase = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def slope(self) -> float:
+        """dy/dt of the fitted line; 0 if there isn't enough spread in t."""
+        n = self._len
+        denom = n * self._stt - self._st * self._st
+        if n < 2 or denom <= 1e-12 * max(1.0, n * self._stt):
+            return 0.0
+        return (n * self._sty - self._st * self._sy) / denom
+
+
+if __name__ == "__main__":
+    # Cross-check against NumPy on random data. Samples are fed in random
+    # pieces: single samples go through add(), longer runs through
+    # add_batch(), and timestamps jitter so they arrive slightly out of order.
+    rng = np.random.default_rng(0)
+    n = 20000
+    xs = rng.normal(50, 20, n)
+    ts = np.arange(n) * 2.0 + rng.uniform(-15, 15, n)
+
+    def pieces():
+        i = 0
+        while i < n:
+            j = min(n, i + int(rng.choice([1, 1, 2, 7, 64, 500, 3000])))
+            yield i, j
+            i = j
+
+    running = RunningStatistics(window=1000)
+    windowed = WindowedStatistics(-50, 150, 400, {"5m": (300, 10), "1h": (3600, 60)})
+    fit = RollingLinearFit(36)
+    trend = 0.01 * ts + rng.normal(0, 0.5, n)
+    for i, j in pieces():
+        if j - i == 1:
+            running.add(xs[i])
+            windowed.add(ts[i], xs[i])
+            fit.add(ts[i], trend[i])
+        else:
+            running.add_batch(xs[i:j])
+            windowed.add_batch(ts[i:j], xs[i:j])
+            fit.add_batch(ts[i:j], trend[i:j])
+
+        # RunningStatistics vs np.var / np.mean over everything so far
+        seen = xs[:j]
+        assert running.count == j
+        assert math.isclose(running.mean, seen.mean(), rel_tol=1e-9)
+        assert math.isclose(running.variance(), np.var(seen), rel_tol=1e-9)
+        assert running.min == seen.min() and running.max == seen.max()
+        assert np.array_equal(running.get_window(), seen[-1000:])
+
+        # RollingLinearFit vs np.polyfit over the last window, in arrival order
+        if j >= 2:
+            expected = np.polyfit(ts[max(0, j - 36) : j], trend[max(0, j - 36) : j], 1)
+            assert math.isclose(fit.slope(), expected[0], rel_tol=1e-6, abs_tol=1e-9)
+
+        # Sliding windows vs a brute-force scan of the samples in live buckets
+        now = float(ts[:j].max())
+        for name, window in windowed.windows.items():
+            width = window.bucket_width
+            current = now // width
+            bucket = ts[:j] // width
+            live = xs[:j][(bucket > current - window._ids.size) & (bucket <= current)]
+            summary = window.summary(now)
+            assert summary["count"] == live.size, name
+            assert math.isclose(summary["mean"], live.mean(), rel_tol=1e-9)
+            assert summary["min"] == live.min() and summary["max"] == live.max()
+            # Sketch quantiles are the midpoint of the bin holding the sample
+            # of that rank, so within half a bin of the exact order statistic
+            half_bin = (window._sketch.hi - window._sketch.lo) / window._sketch.bins / 2
+            in_range = np.clip(live, window._sketch.lo, window._sketch.hi)
+            for q in (0.5, 0.95, 0.99):
+                exact = np.percentile(in_range, q * 100, method="inverted_cdf")
+                assert abs(summary[f"p{round(q * 100):g}"] - exact) <= half_bin + 1e-9
+
+    print(f"Statistics match NumPy over {n} samples")
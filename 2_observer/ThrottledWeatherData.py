@@ -0,0 +1,199 @@
+import threading
+import time
+import weakref
+from typing import Dict
+
+from WeatherStation import *
+
+
+# Rate limiting
+class RateLimiter:
+    """Delivers at most one update per interval to a single observer.
+
+    The first sample after a quiet interval goes out immediately (leading
+    edge). Samples that arrive too soon are held, each one replacing the
+    last, and the newest is delivered when the interval expires (trailing
+    edge). Every sample is counted exactly once as delivered, coalesced
+    (sent late on the trailing edge), dropped (replaced or discarded unsent)
+    or still pending. The observer is held weakly; once it is collected,
+    anything still held for it is discarded.
+
+    The observer is called after the lock is released, so a slow update
+    doesn't hold up producers offering the next sample. Deliveries start
+    at least one interval apart, so they only overlap when an update takes
+    longer than that.
+    """
+
+    observer: weakref.ref
+    min_interval: float
+    delivered: int
+    coalesced: int
+    dropped: int
+    _last_delivery: float
+    _pending: tuple = None
+    _timer: threading.Timer = None
+    _generation: int = 0
+    _lock: threading.Lock
+
+    def __init__(self, observer: "Observer", max_rate: float):
+        if max_rate <= 0:
+            raise ValueError("max_rate must be positive")
+        self.observer = weakref.ref(observer)
+        self.min_interval = 1.0 / max_rate
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self._last_delivery = -float("inf")
+        self._lock = threading.Lock()
+
+    def offer(self, snapshot: "Measurements", batch: bool):
+        samples = snapshot.get_temps().size if batch else 1
+        with self._lock:
+            now = time.monotonic()
+            wait = self._last_delivery + self.min_interval - now
+            if self._pending is None and wait <= 0:
+                self._last_delivery = now
+                self.delivered += samples
+                item = (snapshot, batch)
+            else:
+                if self._pending is not None:
+                    self.dropped += self._pending[2]
+                self._pending = (snapshot, batch, samples)
+                if self._timer is None:
+                    self._generation += 1
+                    self._timer = threading.Timer(
+                        max(wait, 0), self._fire, args=(self._generation,)
+                    )
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self._deliver(item)
+
+    def flush(self):
+        """Deliver any held sample now instead of waiting for the timer."""
+        with self._lock:
+            self._cancel_timer()
+            item = self._take_pending()
+        self._deliver(item)
+
+    def discard(self):
+        """Drop any held sample, counting it as dropped, and stop the timer."""
+        with self._lock:
+            self._cancel_timer()
+            if self._pending is not None:
+                self.dropped += self._pending[2]
+                self._pending = None
+
+    def _cancel_timer(self):
+        # Called with the lock held
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self._generation += 1
+
+    def get_pending(self) -> int:
+        return 0 if self._pending is None else self._pending[2]
+
+    def _fire(self, generation: int):
+        with self._lock:
+            # A timer that flush() cancelled too late may already be waiting
+            # here; it must not take a newer timer's sample early
+            if generation != self._generation:
+                return
+            item = self._take_pending()
+        self._deliver(item)
+
+    def _take_pending(self) -> tuple:
+        # Called with the lock held
+        self._timer = None
+        if self._pending is None:
+            return None
+        snapshot, batch, samples = self._pending
+        self._pending = None
+        self._last_delivery = time.monotonic()
+        self.coalesced += samples
+        return snapshot, batch
+
+    def _deliver(self, item: tuple):
+        observer = self.observer()
+        if item is not None and observer is not None:
+            observer.update_from(*item)
+
+
+class ThrottledWeatherData(WeatherData):
+    """WeatherData with an optional maximum notification rate per observer.
+
+    Observers without a limit (e.g. StatisticsDisplay) still see every
+    sample synchronously; limited ones (e.g. console displays) go through a
+    RateLimiter and may be updated from its timer thread.
+    """
+
+    _limiters: "weakref.WeakKeyDictionary[Observer, RateLimiter]"
+
+    def __init__(self):
+        super().__init__()
+        self._limiters = weakref.WeakKeyDictionary()
+
+    def set_rate_limit(self, observer: "Observer", max_rate: float = None):
+        """Limit observer to max_rate updates per second; None removes the limit."""
+        limiter = self._limiters.pop(observer, None)
+        if limiter is not None:
+            limiter.flush()
+        if max_rate is not None:
+            self._limiters[observer] = RateLimiter(observer, max_rate)
+
+    def remove_observer(self, observer: "Observer"):
+        super().remove_observer(observer)
+        # A removed observer gets nothing more, not even the held sample
+        limiter = self._limiters.pop(observer, None)
+        if limiter is not None:
+            limiter.discard()
+
+    def notify_observers(self):
+        self._dispatch(False)
+
+    def notify_observers_batch(self):
+        self._dispatch(True)
+
+    def flush(self):
+        for limiter in self._limiters.values():
+            limiter.flush()
+
+    def get_rate_limit_stats(self) -> Dict["Observer", dict]:
+        return {
+            obs: {
+                "delivered": limiter.delivered,
+                "coalesced": limiter.coalesced,
+                "dropped": limiter.dropped,
+                "pending": limiter.get_pending(),
+            }
+            for obs, limiter in self._limiters.items()
+        }
+
+    def _dispatch(self, batch: bool):
+        snapshot = self.snapshot() if self._limiters else None
+        for obs in self.observers:
+            limiter = self._limiters.get(obs)
+            if limiter is not None:
+                limiter.offer(snapshot, batch)
+            elif batch:
+                obs.update_batch()
+            else:
+                obs.update()
+
+
+if __name__ == "__main__":
+    wd = ThrottledWeatherData()
+
+    current_conditions_display = CurrentConditionsDisplay(wd)
+    statistics_display = StatisticsDisplay(wd)
+    statistics_display.display = lambda: None
+    wd.set_rate_limit(current_conditions_display, 1)
+
+    for i in range(300):
+        wd.set_measurements(70 + i / 100, 30.0, 60)
+        time.sleep(0.01)
+    wd.flush()
+
+    print(wd.get_rate_limit_stats())
+    print(f"Statistics saw {statistics_display.get_temp_stats().count} samples")
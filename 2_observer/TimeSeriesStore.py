@@ -0,0 +1,135 @@
+import os
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+# Time-series store
+class TimeSeriesStore:
+    """Append-only columnar store of measurements on disk.
+
+    Each column is a flat file of native float64 values in `path`, so the
+    row count is just the file size / 8 and reads are numpy.memmap views:
+    slicing a time range copies nothing into the heap. Timestamps must be
+    non-decreasing, which lets range lookups binary-search the timestamp
+    column; appends that would break the order raise ValueError and write
+    nothing.
+    """
+
+    COLUMNS = ("timestamp", "temp_f", "pressure", "humidity")
+    DTYPE = np.dtype(np.float64)
+
+    path: str
+    _files: Dict[str, object]
+    _maps: Dict[str, np.memmap]
+    _mapped_len: int
+    _len: int
+    _last_timestamp: float
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._files = {col: open(self._column_path(col), "ab") for col in self.COLUMNS}
+
+        # A crash mid-append can leave columns ragged; trust the shortest
+        sizes = [os.path.getsize(self._column_path(col)) for col in self.COLUMNS]
+        self._len = min(sizes) // self.DTYPE.itemsize
+        for col, size in zip(self.COLUMNS, sizes):
+            if size != self._len * self.DTYPE.itemsize:
+                self._files[col].truncate(self._len * self.DTYPE.itemsize)
+
+        self._last_timestamp = -np.inf
+        if self._len > 0:
+            with open(self._column_path("timestamp"), "rb") as f:
+                f.seek((self._len - 1) * self.DTYPE.itemsize)
+                last = np.frombuffer(f.read(self.DTYPE.itemsize), dtype=self.DTYPE)
+            self._last_timestamp = float(last[0])
+
+        self._maps = {}
+        self._mapped_len = 0
+
+    def _column_path(self, col: str) -> str:
+        return os.path.join(self.path, col + ".f64")
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, timestamp: float, temp_f: float, pressure: float, humidity: float):
+        if not timestamp >= self._last_timestamp:
+            raise ValueError(
+                f"Timestamp {timestamp} is older than the last stored "
+                f"({self._last_timestamp})"
+            )
+        for col, value in zip(self.COLUMNS, (timestamp, temp_f, pressure, humidity)):
+            self._files[col].write(self.DTYPE.type(value).tobytes())
+        self._len += 1
+        self._last_timestamp = float(timestamp)
+
+    def append_batch(self, timestamps, temps, pressures, humidities):
+        columns = [
+            np.ascontiguousarray(c, dtype=self.DTYPE)
+            for c in (timestamps, temps, pressures, humidities)
+        ]
+        n = columns[0].size
+        if any(c.ndim != 1 or c.size != n for c in columns):
+            raise ValueError("Batch columns must be 1-D arrays of equal length")
+        if n == 0:
+            return
+        timestamps = columns[0]
+        if not (
+            timestamps[0] >= self._last_timestamp
+            and np.all(timestamps[1:] >= timestamps[:-1])
+        ):
+            raise ValueError(
+                "Batch timestamps must be non-decreasing and no older than "
+                f"the last stored ({self._last_timestamp})"
+            )
+        for col, values in zip(self.COLUMNS, columns):
+            self._files[col].write(values.tobytes())
+        self._len += n
+        self._last_timestamp = float(timestamps[-1])
+
+    def flush(self):
+        for f in self._files.values():
+            f.flush()
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._maps = {}
+
+    def get_column(self, col: str) -> np.ndarray:
+        """Read-only view over every row of a column."""
+        if self._mapped_len != self._len:
+            self._remap()
+        if self._len == 0:
+            return np.empty(0, dtype=self.DTYPE)
+        return self._maps[col]
+
+    def _remap(self):
+        # Pending writes must hit the file before the mapping can see them
+        self.flush()
+        self._maps = {}
+        if self._len > 0:
+            for col in self.COLUMNS:
+                self._maps[col] = np.memmap(
+                    self._column_path(col),
+                    dtype=self.DTYPE,
+                    mode="r",
+                    shape=(self._len,),
+                )
+        self._mapped_len = self._len
+
+    def index_range(self, start: float = None, end: float = None) -> Tuple[int, int]:
+        """Row indexes [i, j) whose timestamps fall in [start, end)."""
+        ts = self.get_column("timestamp")
+        i = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        j = len(ts) if end is None else int(np.searchsorted(ts, end, side="left"))
+        return i, max(i, j)
+
+    def read_range(
+        self, start: float = None, end: float = None
+    ) -> Dict[str, np.ndarray]:
+        """Zero-copy views of every column for timestamps in [start, end)."""
+        i, j = self.index_range(start, end)
+        return {col: self.get_column(col)[i:j] for col in self.COLUMNS}
@@ -0,0 +1,290 @@
+import time
+import weakref
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+import numpy as np
+from Statistics import WindowedStatistics
+from WeatherStation import *
+
+
+# Multi-station hub
+class StationObserver(ABC):
+    @abstractmethod
+    def update_station(self, station_id: str, source: "Measurements"):
+        raise NotImplementedError
+
+
+class WeatherHub:
+    """Routes measurements from many stations to interested observers.
+
+    A station is just a row in three growable float arrays, so an idle
+    station costs its ID string and one dict slot. Observers subscribe to a
+    single station, to every station whose ID starts with a region prefix,
+    or to everything. Each station's matching subscription buckets are
+    resolved once and cached until a bucket is created or removed.
+
+    StationObserver instances get update_station(station_id, measurements);
+    any other Observer is updated via update_from. Displays built with no
+    WeatherData (e.g. StatisticsDisplay()) read the hub's measurements that
+    way.
+    """
+
+    _index: Dict[str, int]
+    _temps: np.ndarray
+    _pressures: np.ndarray
+    _humidities: np.ndarray
+    _timestamps: np.ndarray
+
+    _by_station: Dict[str, "ObserverRegistry"]
+    _by_prefix: Dict[str, "ObserverRegistry"]
+    _prefix_lengths: List[int]
+    _everyone: "ObserverRegistry"
+    _keys: "weakref.WeakKeyDictionary"
+    _routes: Dict[str, Tuple["ObserverRegistry", ...]]
+
+    def __init__(self, capacity: int = 1024):
+        self._index = {}
+        self._temps = np.full(capacity, np.nan)
+        self._pressures = np.full(capacity, np.nan)
+        self._humidities = np.full(capacity, np.nan)
+        self._timestamps = np.full(capacity, np.nan)
+
+        self._by_station = {}
+        self._by_prefix = {}
+        self._prefix_lengths = []
+        self._everyone = ObserverRegistry()
+        self._keys = weakref.WeakKeyDictionary()
+        self._routes = {}
+
+    # Stations
+    def add_station(self, station_id: str) -> int:
+        row = self._index.get(station_id)
+        if row is not None:
+            return row
+
+        row = len(self._index)
+        if row == self._temps.size:
+            self._grow()
+        self._index[station_id] = row
+        return row
+
+    def _grow(self):
+        for name in ("_temps", "_pressures", "_humidities", "_timestamps"):
+            old = getattr(self, name)
+            new = np.full(max(1, old.size * 2), np.nan)
+            new[: old.size] = old
+            setattr(self, name, new)
+
+    def get_stations(self) -> List[str]:
+        return list(self._index)
+
+    def get_station(self, station_id: str) -> "Measurements":
+        row = self._index[station_id]
+        return Measurements(
+            float(self._temps[row]),
+            float(self._pressures[row]),
+            float(self._humidities[row]),
+            timestamp=float(self._timestamps[row]),
+        )
+
+    # Subscriptions
+    def subscribe_station(self, observer, station_id: str):
+        self._subscribe(observer, self._by_station, station_id)
+
+    def subscribe_region(self, observer, prefix: str):
+        if prefix not in self._by_prefix:
+            self._prefix_lengths = sorted(set(self._prefix_lengths) | {len(prefix)})
+        self._subscribe(observer, self._by_prefix, prefix)
+
+    def subscribe_all(self, observer):
+        if observer in self._everyone:
+            return
+        self._everyone.add(observer)
+        self._keys.setdefault(observer, []).append((None, None))
+
+    def unsubscribe(self, observer):
+        for index, key in self._keys.pop(observer, []):
+            if index is None:
+                self._everyone.remove(observer)
+                continue
+            bucket = index[key]
+            bucket.remove(observer)
+            if not len(bucket):
+                self._drop_bucket(index, key, bucket)
+
+    def _subscribe(self, observer, index: Dict[str, "ObserverRegistry"], key: str):
+        bucket = index.get(key)
+        if bucket is None:
+            # A bucket whose last observer is collected removes itself
+            bucket = index[key] = ObserverRegistry(
+                on_empty=lambda: self._drop_bucket(index, key, bucket)
+            )
+            self._routes.clear()
+        elif observer in bucket:
+            return
+        bucket.add(observer)
+        self._keys.setdefault(observer, []).append((index, key))
+
+    def _drop_bucket(
+        self, index: Dict[str, "ObserverRegistry"], key: str, bucket: "ObserverRegistry"
+    ):
+        # The key may have been given a new bucket since this one emptied
+        if index.get(key) is not bucket:
+            return
+        del index[key]
+        self._routes.clear()
+        if index is self._by_prefix:
+            self._prefix_lengths = sorted({len(p) for p in self._by_prefix})
+
+    def _route(self, station_id: str) -> Tuple["ObserverRegistry", ...]:
+        route = self._routes.get(station_id)
+        if route is None:
+            buckets = []
+            if station_id in self._by_station:
+                buckets.append(self._by_station[station_id])
+            for length in self._prefix_lengths:
+                bucket = self._by_prefix.get(station_id[:length])
+                if bucket is not None:
+                    buckets.append(bucket)
+            buckets.append(self._everyone)
+            route = self._routes[station_id] = tuple(buckets)
+        return route
+
+    # Ingestion
+    def set_measurements(
+        self, station_id: str, temp_f: float, pressure: float, humidity: float
+    ):
+        row = self.add_station(station_id)
+        self._temps[row] = temp_f
+        self._pressures[row] = pressure
+        self._humidities[row] = humidity
+        self._timestamps[row] = timestamp = time.time()
+
+        self._notify(
+            station_id,
+            Measurements(temp_f, pressure, humidity, timestamp=timestamp),
+            False,
+        )
+
+    def set_measurements_batch(
+        self, station_id: str, temps, pressures, humidities, timestamps=None
+    ):
+        # Copied and read-only, as in WeatherData: observers are handed
+        # these arrays and must not share them with the caller
+        temps = np.array(temps, dtype=float)
+        pressures = np.array(pressures, dtype=float)
+        humidities = np.array(humidities, dtype=float)
+        if temps.ndim != 1 or not (temps.shape == pressures.shape == humidities.shape):
+            raise ValueError("Batch measurements must be 1-D arrays of equal length")
+        if temps.size == 0:
+            return
+
+        row = self.add_station(station_id)
+        if timestamps is None:
+            # Spread over the time since the station's last sample, as
+            # WeatherData does
+            timestamps = spread_timestamps(temps.size, self._timestamps[row])
+        else:
+            timestamps = np.array(timestamps, dtype=float)
+            if timestamps.shape != temps.shape:
+                raise ValueError("Batch timestamps must match the measurements' length")
+        for array in (temps, pressures, humidities, timestamps):
+            array.setflags(write=False)
+        self._temps[row] = temps[-1]
+        self._pressures[row] = pressures[-1]
+        self._humidities[row] = humidities[-1]
+        self._timestamps[row] = timestamps[-1]
+
+        source = Measurements(
+            float(temps[-1]),
+            float(pressures[-1]),
+            float(humidities[-1]),
+            temps,
+            pressures,
+            humidities,
+            float(timestamps[-1]),
+            timestamps,
+        )
+        self._notify(station_id, source, True)
+
+    def _notify(self, station_id: str, source: "Measurements", batch: bool):
+        route = self._route(station_id)
+        seen = set() if len(route) > 1 else None
+        for bucket in route:
+            for obs in bucket:
+                if seen is not None:
+                    if id(obs) in seen:
+                        continue
+                    seen.add(id(obs))
+                if isinstance(obs, StationObserver):
+                    obs.update_station(station_id, source)
+                else:
+                    obs.update_from(source, batch)
+
+
+# Per-station aggregation
+class StationWindowedStatistics(StationObserver):
+    """Sliding-window temperature/humidity quantiles for every station seen.
+
+    Windows are created on a station's first sample. Each one costs
+    (buckets x bins) int32 counters per variable, so tune `windows` and the
+    bin counts to the station count.
+    """
+
+    _stats: Dict[str, Tuple["WindowedStatistics", "WindowedStatistics"]]
+    _windows: Dict[str, tuple]
+
+    def __init__(self, windows: Dict[str, tuple] = None):
+        self._stats = {}
+        self._windows = windows
+
+    def update_station(self, station_id: str, source: "Measurements"):
+        stats = self._stats.get(station_id)
+        if stats is None:
+            stats = self._stats[station_id] = (
+                WindowedStatistics(-60, 140, 200, self._windows),
+                WindowedStatistics(0, 100, 100, self._windows),
+            )
+        timestamps = source.get_timestamps()
+        stats[0].add_batch(timestamps, source.get_temps())
+        stats[1].add_batch(timestamps, source.get_humidities())
+
+    def summary(self, station_id: str, now: float) -> Dict[str, Dict[str, dict]]:
+        temp_f, humidity = self._stats[station_id]
+        return {"temp_f": temp_f.summary(now), "humidity": humidity.summary(now)}
+
+
+# Displays
+class StationConditionsDisplay(Display, StationObserver):
+    _station_id: str
+    _temp_f: float
+    _pressure: float
+    _humidity: float
+
+    def update_station(self, station_id: str, source: "Measurements"):
+        self._station_id = station_id
+        self._temp_f = source.get_temp()
+        self._pressure = source.get_pressure()
+        self._humidity = source.get_humidity()
+
+        self.display()
+
+    def display(self):
+        print(
+            f"[{self._station_id}] {self._temp_f}F degrees, {self._pressure} pressure, and {self._humidity}% humidity"
+        )
+
+
+if __name__ == "__main__":
+    hub = WeatherHub()
+
+    bay_area_display = StationConditionsDisplay()
+    hub.subscribe_region(bay_area_display, "us/ca/")
+    statistics_display = StatisticsDisplay()
+    hub.subscribe_station(statistics_display, "us/ny/nyc-01")
+
+    hub.set_measurements("us/ca/sfo-01", 62, 30.1, 80)
+    hub.set_measurements("us/ny/nyc-01", 75, 29.9, 60)
+    hub.set_measurements("us/ca/sjc-02", 71, 30.0, 55)
+    hub.set_measurements_batch("us/ny/nyc-01", [76, 77], [29.8, 29.8], [61, 62])
@@ -1,10 +1,14 @@
-import random
 import time
+import weakref
 from abc import ABC, abstractmethod
 from ast import Str
-from typing import List
+from enum import Enum
+from typing import Callable, Dict, Iterator, List
 
 import numpy as np
+from Instrumentation import ObserverMetrics
+from Statistics import RollingLinearFit, RunningStatistics, WindowedStatistics
+from TimeSeriesStore import TimeSeriesStore
 
 
 # Observer pattern
@@ -15,9 +19,99 @@ class Observer(ABC):
     def update(self):
         raise NotImplementedError
 
+    def update_batch(self):
+        # Observers that don't understand batches just see the latest sample
+        self.update()
+
+    def update_from(self, source: "Measurements", batch: bool = False):
+        # Dispatchers that deliver later (async, parallel, throttled, the hub)
+        # pass a frozen snapshot here. Observers that can read from it
+        # override this; the rest are just notified and read what they
+        # normally read.
+        if batch:
+            self.update_batch()
+        else:
+            self.update()
+
+
+class MeasurementsObserver(Observer):
+    """An Observer that reads each update from a Measurements source.
+
+    When notified directly the source is the WeatherData it registered with;
+    deferred dispatchers pass their snapshot to update_from instead. Either
+    way the source is an argument, so reading a snapshot never touches the
+    observer's own reference to its subject.
+    """
+
+    _wd: "Measurements" = None
+
+    def update(self):
+        self.update_from(self._wd)
+
+    def update_batch(self):
+        self.update_from(self._wd, batch=True)
+
+    @abstractmethod
+    def update_from(self, source: "Measurements", batch: bool = False):
+        raise NotImplementedError
+
+
+class FieldObserver(ABC):
+    @abstractmethod
+    def update_fields(self, changes: Dict["Field", float]):
+        raise NotImplementedError
+
+
+class ObserverRegistry:
+    """Registration-ordered set of observers held by weak reference.
+
+    Add and remove are O(1) dict operations keyed on identity, iteration
+    follows registration order, and an observer that is garbage collected
+    without being removed silently drops out of the registry. If that
+    leaves the registry empty, on_empty (if given) is called, so an owner
+    keeping many registries can drop the empty ones. Subjects keep their
+    per-observer state in WeakKeyDictionaries for the same reason.
+    """
+
+    _refs: Dict[int, weakref.ref]
+    _on_empty: Callable[[], None]
+
+    def __init__(self, on_empty: Callable[[], None] = None):
+        self._refs = {}
+        self._on_empty = on_empty
+
+    def add(self, observer: "Observer"):
+        key = id(observer)
+        if key in self._refs:
+            return
+        self._refs[key] = weakref.ref(observer, lambda _, key=key: self._collect(key))
+
+    def _collect(self, key: int):
+        if self._refs.pop(key, None) is not None and not self._refs:
+            if self._on_empty is not None:
+                self._on_empty()
+
+    def remove(self, observer: "Observer"):
+        if self._refs.pop(id(observer), None) is None:
+            raise ValueError("Observer is not registered")
+
+    def __contains__(self, observer: "Observer") -> bool:
+        return id(observer) in self._refs
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def __iter__(self) -> Iterator["Observer"]:
+        # Copy first: collection (or an observer unregistering itself) may
+        # change the dict while we dispatch
+        for ref in list(self._refs.values()):
+            observer = ref()
+            if observer is not None:
+                yield observer
+
 
 class Subject(ABC):
-    observers: List["Observer"]
+    observers: "ObserverRegistry"
 
     @abstractmethod
     def register_observer(self, observer: "Observer"):
@@ -41,62 +135,333 @@ class Display(ABC):
         raise NotImplementedError
 
 
-# WeatherData
+# Measurements
+
+
+class Field(Enum):
+    # Values are the attribute names the measurement is stored under
+    TEMP = "_temp_f"
+    PRESSURE = "_pressure"
+    HUMIDITY = "_humidity"
+
 
+class Measurements:
+    """The latest sample (and batch, if any) with the getters observers pull.
+
+    WeatherData is one of these; snapshot() freezes its current values into a
+    standalone, picklable copy for deferred or out-of-process delivery.
+    """
 
-class WeatherData(Subject):
     _temp_f: float
     _pressure: float
     _humidity: float
+    _temps: np.ndarray = None
+    _pressures: np.ndarray = None
+    _humidities: np.ndarray = None
+    _timestamp: float = None
+    _timestamps: np.ndarray = None
+
+    def __init__(
+        self,
+        temp_f: float,
+        pressure: float,
+        humidity: float,
+        temps: np.ndarray = None,
+        pressures: np.ndarray = None,
+        humidities: np.ndarray = None,
+        timestamp: float = None,
+        timestamps: np.ndarray = None,
+    ):
+        self._temp_f = temp_f
+        self._pressure = pressure
+        self._humidity = humidity
+        self._temps = temps
+        self._pressures = pressures
+        self._humidities = humidities
+        self._timestamp = time.time() if timestamp is None else timestamp
+        self._timestamps = timestamps
+
+    def get_temp(self) -> float:
+        return self._temp_f
+
+    def get_pressure(self) -> float:
+        return self._pressure
+
+    def get_humidity(self) -> float:
+        return self._humidity
+
+    def get_timestamp(self) -> float:
+        return self._timestamp
+
+    # Batch getters fall back to the latest scalar sample as a 1-element array
+    def get_temps(self) -> np.ndarray:
+        if self._temps is None:
+            return np.array([self._temp_f], dtype=float)
+        return self._temps
+
+    def get_pressures(self) -> np.ndarray:
+        if self._pressures is None:
+            return np.array([self._pressure], dtype=float)
+        return self._pressures
 
-    def __init__(self):
-        self.observers = []
+    def get_humidities(self) -> np.ndarray:
+        if self._humidities is None:
+            return np.array([self._humidity], dtype=float)
+        return self._humidities
+
+    def get_timestamps(self) -> np.ndarray:
+        if self._timestamps is None:
+            return np.array([self._timestamp], dtype=float)
+        return self._timestamps
+
+
+def spread_timestamps(n: int, last: float = None, now: float = None) -> np.ndarray:
+    """Timestamps for a batch of n samples that arrived without any.
+
+    The samples are taken to be evenly spaced over the interval since the
+    previous sample at `last`, the newest one taken now, so windows and
+    trend fits see them spread out rather than all at one instant. With no
+    previous sample (or a clock that went backwards) there is no interval
+    to spread over, and all n are stamped now.
+    """
+    now = time.time() if now is None else now
+    if last is None or not last < now:
+        return np.full(n, now)
+    return np.linspace(last, now, n + 1)[1:]
+
+
+# WeatherData
+
+
+class FieldSubscription:
+    # Weak, like the observer registry, so a subscription doesn't keep its
+    # observer alive
+    observer: weakref.ref
+    thresholds: Dict["Field", float]
+    last_sent: Dict["Field", float]
+
+    def __init__(
+        self,
+        observer: "FieldObserver",
+        thresholds: Dict["Field", float],
+        on_collect=None,
+    ):
+        self.observer = weakref.ref(observer, on_collect)
+        self.thresholds = thresholds
+        self.last_sent = {}
+
+
+class WeatherData(Subject, Measurements):
+    _dirty: List["Field"]
+    _field_subscriptions: Dict["Field", List["FieldSubscription"]]
+    _subscriptions: Dict[int, "FieldSubscription"]
+    _store: "TimeSeriesStore"
+    _metrics: "ObserverMetrics" = None
+
+    def __init__(self, store: "TimeSeriesStore" = None):
+        self.observers = ObserverRegistry()
+        self._store = store
+        self._temp_f = self._pressure = self._humidity = None
+        self._dirty = []
+        self._field_subscriptions = {field: [] for field in Field}
+        self._subscriptions = {}
 
     def register_observer(self, observer: "Observer"):
-        self.observers.append(observer)
+        self.observers.add(observer)
 
     def remove_observer(self, observer: "Observer"):
         self.observers.remove(observer)
 
     def notify_observers(self):
-        for obs in self.observers:
-            obs.update()
+        if self._metrics is None:
+            for obs in self.observers:
+                obs.update()
+        else:
+            for obs in self.observers:
+                self._metrics.call(obs, obs.update)
+
+    def notify_observers_batch(self):
+        if self._metrics is None:
+            for obs in self.observers:
+                obs.update_batch()
+        else:
+            for obs in self.observers:
+                self._metrics.call(obs, obs.update_batch)
+
+    def enable_metrics(self) -> "ObserverMetrics":
+        """Start timing every observer update; disabled costs one None check."""
+        if self._metrics is None:
+            self._metrics = ObserverMetrics()
+        return self._metrics
+
+    def disable_metrics(self):
+        self._metrics = None
+
+    def get_metrics(self) -> "ObserverMetrics":
+        return self._metrics
+
+    def subscribe_fields(
+        self, observer: "FieldObserver", thresholds: Dict["Field", float]
+    ):
+        """Deliver change-sets for the given fields to observer.update_fields.
+
+        A field is only included once it has moved by more than its threshold
+        since the value last sent to this observer (a threshold of 0 means any
+        change). Updates with nothing to report are never dispatched.
+        """
+        key = id(observer)
+        if key in self._subscriptions:
+            self.unsubscribe_fields(observer)
+        sub = FieldSubscription(
+            observer, dict(thresholds), lambda _, key=key: self._drop_subscription(key)
+        )
+        self._subscriptions[key] = sub
+        for field in sub.thresholds:
+            self._field_subscriptions[field].append(sub)
+
+    def unsubscribe_fields(self, observer: "FieldObserver"):
+        if self._drop_subscription(id(observer)) is None:
+            raise ValueError("Observer is not subscribed")
+
+    def _drop_subscription(self, key: int) -> "FieldSubscription":
+        sub = self._subscriptions.pop(key, None)
+        if sub is not None:
+            for field in sub.thresholds:
+                self._field_subscriptions[field].remove(sub)
+        return sub
+
+    def notify_field_subscribers(self):
+        if not self._subscriptions:
+            return
+
+        changesets: Dict["FieldSubscription", Dict["Field", float]] = {}
+        for field in self._dirty:
+            value = getattr(self, field.value)
+            for sub in self._field_subscriptions[field]:
+                last = sub.last_sent.get(field)
+                if last is not None and abs(value - last) <= sub.thresholds[field]:
+                    continue
+                sub.last_sent[field] = value
+                changesets.setdefault(sub, {})[field] = value
+
+        for sub, changes in changesets.items():
+            observer = sub.observer()
+            if observer is not None:
+                observer.update_fields(changes)
+
+    def get_changed_fields(self) -> List["Field"]:
+        return self._dirty
+
+    def get_store(self) -> "TimeSeriesStore":
+        return self._store
 
     def set_measurements(self, temp_f: float, pressure: float, humidity: float):
+        self._store_measurements(temp_f, pressure, humidity)
+
+        self.measurements_changed()
+
+    def set_measurements_batch(self, temps, pressures, humidities, timestamps=None):
+        if self._store_measurements_batch(temps, pressures, humidities, timestamps):
+            self.measurements_batch_changed()
+
+    def _store_measurements(self, temp_f: float, pressure: float, humidity: float):
+        # The wall clock can step back (e.g. NTP); samples must not, or the
+        # store rejects them
+        timestamp = time.time()
+        if self._timestamp is not None and timestamp < self._timestamp:
+            timestamp = self._timestamp
+        # Store first, so a rejected sample leaves everything as it was
+        if self._store is not None:
+            self._store.append(timestamp, temp_f, pressure, humidity)
+        self._timestamp = timestamp
+        self._mark_dirty(temp_f, pressure, humidity)
         self._temp_f = temp_f
         self._pressure = pressure
         self._humidity = humidity
-
-        self.measurements_changed()
+        self._temps = self._pressures = self._humidities = self._timestamps = None
+
+    def _store_measurements_batch(
+        self, temps, pressures, humidities, timestamps=None
+    ) -> bool:
+        # Copy the caller's buffers: snapshots and queued updates share these
+        # arrays, so they must not change under them, nor be changed by them
+        temps = np.array(temps, dtype=float)
+        pressures = np.array(pressures, dtype=float)
+        humidities = np.array(humidities, dtype=float)
+        if temps.ndim != 1 or not (temps.shape == pressures.shape == humidities.shape):
+            raise ValueError("Batch measurements must be 1-D arrays of equal length")
+        if temps.size == 0:
+            return False
+
+        if timestamps is None:
+            timestamps = spread_timestamps(temps.size, self._timestamp)
+        else:
+            timestamps = np.array(timestamps, dtype=float)
+            if timestamps.shape != temps.shape:
+                raise ValueError("Batch timestamps must match the measurements' length")
+        for array in (temps, pressures, humidities, timestamps):
+            array.setflags(write=False)
+        if self._store is not None:
+            self._store.append_batch(timestamps, temps, pressures, humidities)
+
+        self._mark_dirty(temps[-1], pressures[-1], humidities[-1])
+        self._temps = temps
+        self._pressures = pressures
+        self._humidities = humidities
+        self._timestamps = timestamps
+        self._timestamp = float(timestamps[-1])
+        self._temp_f = float(temps[-1])
+        self._pressure = float(pressures[-1])
+        self._humidity = float(humidities[-1])
+        return True
+
+    def _mark_dirty(self, temp_f: float, pressure: float, humidity: float):
+        self._dirty = [
+            field
+            for field, value in zip(Field, (temp_f, pressure, humidity))
+            if getattr(self, field.value) != value
+        ]
 
     def measurements_changed(self):
         self.notify_observers()
-
-    def get_temp(self) -> float:
-        return self._temp_f
-
-    def get_pressure(self) -> float:
-        return self._pressure
-
-    def get_humidity(self) -> float:
-        return self._humidity
+        self.notify_field_subscribers()
+
+    def measurements_batch_changed(self):
+        self.notify_observers_batch()
+        self.notify_field_subscribers()
+
+    def snapshot(self) -> "Measurements":
+        return Measurements(
+            self._temp_f,
+            self._pressure,
+            self._humidity,
+            self._temps,
+            self._pressures,
+            self._humidities,
+            self._timestamp,
+            self._timestamps,
+        )
 
 
 # Displays
-class CurrentConditionsDisplay(Display, Observer):
+# Every display takes the WeatherData to register with; pass None for one
+# that is fed some other way, e.g. subscribed to a WeatherHub.
+class CurrentConditionsDisplay(Display, MeasurementsObserver):
     _wd: "WeatherData"
     _temp_f: float
     _pressure: float
     _humidity: float
 
-    def __init__(self, wd: "WeatherData"):
+    def __init__(self, wd: "WeatherData" = None):
         self._wd = wd
-        self._wd.register_observer(self)
+        if wd is not None:
+            wd.register_observer(self)
 
-    def update(self):
-        self._temp_f = self._wd.get_temp()
-        self._pressure = self._wd.get_pressure()
-        self._humidity = self._wd.get_humidity()
+    def update_from(self, source: "Measurements", batch: bool = False):
+        # Only the most recent sample of a block is worth showing
+        self._temp_f = source.get_temp()
+        self._pressure = source.get_pressure()
+        self._humidity = source.get_humidity()
 
         self.display()
 
@@ -106,118 +471,247 @@ class CurrentConditionsDisplay(Display, Observer):
         )
 
 
-class StatisticsDisplay(Display, Observer):
+class StatisticsDisplay(Display, MeasurementsObserver):
     _wd: "WeatherData"
-    _temp_f = None
-    _pressure = None
-    _humidity = None
+    _temp_f: RunningStatistics
+    _pressure: RunningStatistics
+    _humidity: RunningStatistics
 
-    def __init__(self, wd: "WeatherData"):
+    def __init__(self, wd: "WeatherData" = None, window: int = 0):
         self._wd = wd
-        self._temp_f = np.array([])
-        self._pressure = np.array([])
-        self._humidity = np.array([])
+        self._temp_f = RunningStatistics(window)
+        self._pressure = RunningStatistics(window)
+        self._humidity = RunningStatistics(window)
+
+        if wd is not None:
+            wd.register_observer(self)
+
+    def update_from(self, source: "Measurements", batch: bool = False):
+        if batch:
+            self._temp_f.add_batch(source.get_temps())
+            self._pressure.add_batch(source.get_pressures())
+            self._humidity.add_batch(source.get_humidities())
+        else:
+            self._temp_f.add(source.get_temp())
+            self._pressure.add(source.get_pressure())
+            self._humidity.add(source.get_humidity())
 
-        self._wd.register_observer(self)
+        self.display()
 
-    def update(self):
-        self._temp_f = self._wd.get_temp()
-        self._pressure = self._wd.get_pressure()
-        self._humidity = self._wd.get_humidity()
+    def backfill(
+        self, store: "TimeSeriesStore", start: float = None, end: float = None
+    ):
+        """Fold stored history in [start, end) into the running statistics."""
+        history = store.read_range(start, end)
+        self._temp_f.add_batch(history["temp_f"])
+        self._pressure.add_batch(history["pressure"])
+        self._humidity.add_batch(history["humidity"])
+
+    def get_temp_stats(self) -> RunningStatistics:
+        return self._temp_f
+
+    def get_pressure_stats(self) -> RunningStatistics:
+        return self._pressure
+
+    def get_humidity_stats(self) -> RunningStatistics:
+        return self._humidity
+
+    def display(self):
+        if self._temp_f.count > 0:
+            print(
+                f"Avg/max/min temperature: {self._temp_f.mean}/{self._temp_f.max}/{self._temp_f.min}"
+            )
+
+
+class WindowedStatisticsDisplay(Display, MeasurementsObserver):
+    """p50/p95/p99 temperature and humidity over sliding time windows."""
+
+    _wd: "WeatherData"
+    _temp_f: WindowedStatistics
+    _humidity: WindowedStatistics
+    _now: float
+
+    def __init__(self, wd: "WeatherData" = None, windows: Dict[str, tuple] = None):
+        self._wd = wd
+        # 1F / 1% bins over a plausible surface range
+        self._temp_f = WindowedStatistics(-60, 140, 200, windows)
+        self._humidity = WindowedStatistics(0, 100, 100, windows)
+
+        if wd is not None:
+            wd.register_observer(self)
+
+    def update_from(self, source: "Measurements", batch: bool = False):
+        if batch:
+            timestamps = source.get_timestamps()
+            self._now = float(timestamps[-1])
+            self._temp_f.add_batch(timestamps, source.get_temps())
+            self._humidity.add_batch(timestamps, source.get_humidities())
+        else:
+            self._now = source.get_timestamp()
+            self._temp_f.add(self._now, source.get_temp())
+            self._humidity.add(self._now, source.get_humidity())
 
         self.display()
 
+    def get_summary(self) -> Dict[str, Dict[str, dict]]:
+        return {
+            "temp_f": self._temp_f.summary(self._now),
+            "humidity": self._humidity.summary(self._now),
+        }
+
     def display(self):
-        if np.size(self._temp_f) > 0:
+        for name, stats in self.get_summary()["temp_f"].items():
             print(
-                f"Avg/max/min temperature: {np.average(self._temp_f)}/{np.max(self._temp_f)}/{np.min(self._temp_f)}"
+                f"{name} temperature p50/p95/p99: {stats['p50']}/{stats['p95']}/{stats['p99']}"
             )
 
 
-class ForecastDisplay(Display, Observer):
+class ForecastDisplay(Display, MeasurementsObserver):
+    """Barometer-style forecast from the pressure trend.
+
+    A rolling least-squares line through the last `window` pressure samples
+    gives the trend in inHg per hour: rising pressure means improving
+    weather, falling pressure means cooler, rainy weather. A temperature
+    trend is fitted alongside for observers that want it.
+    """
+
     _wd: "WeatherData"
     _forecasts: List[str]
-
-    def __init__(self, wd: "WeatherData"):
+    _pressure_fit: RollingLinearFit
+    _temp_fit: RollingLinearFit
+    _threshold: float
+    _forecast: str
+
+    def __init__(
+        self, wd: "WeatherData" = None, window: int = 36, threshold: float = 0.02
+    ):
         self._wd = wd
-        self._wd.register_observer(self)
+        if wd is not None:
+            wd.register_observer(self)
 
         self._forecasts = [
             "Improving weather on the way!",
             "Watch out for cooler, rainy weather",
             "More of the same",
         ]
+        self._pressure_fit = RollingLinearFit(window)
+        self._temp_fit = RollingLinearFit(window)
+        self._threshold = threshold
+
+    def update_from(self, source: "Measurements", batch: bool = False):
+        if batch:
+            timestamps = source.get_timestamps()
+            self._pressure_fit.add_batch(timestamps, source.get_pressures())
+            self._temp_fit.add_batch(timestamps, source.get_temps())
+        else:
+            timestamp = source.get_timestamp()
+            self._pressure_fit.add(timestamp, source.get_pressure())
+            self._temp_fit.add(timestamp, source.get_temp())
+        self._forecast = self.classify(self.get_pressure_trend())
 
-    def update(self):
         self.display()
 
+    def get_pressure_trend(self) -> float:
+        # Fits are per second; forecasts read more naturally per hour
+        return self._pressure_fit.slope() * 3600
+
+    def get_temp_trend(self) -> float:
+        return self._temp_fit.slope() * 3600
+
+    def classify(self, pressure_trend: float) -> str:
+        if pressure_trend > self._threshold:
+            return self._forecasts[0]
+        if pressure_trend < -self._threshold:
+            return self._forecasts[1]
+        return self._forecasts[2]
+
     def display(self):
-        print(f"Forecast: {random.choice(self._forecasts)}")
+        print(f"Forecast: {self._forecast}")
+
+
+class TemperatureChangeDisplay(Display, FieldObserver):
+    _wd: "WeatherData"
+    _temp_f: float = None
+
+    def __init__(self, wd: "WeatherData", threshold: float = 0.5):
+        self._wd = wd
+        self._wd.subscribe_fields(self, {Field.TEMP: threshold})
+
+    def update_fields(self, changes: Dict["Field", float]):
+        self._temp_f = changes[Field.TEMP]
+
+        self.display()
+
+    def display(self):
+        print(f"Temperature changed to {self._temp_f}F degrees")
+
+
+# Heat index
+
+# Row k holds the coefficients of T**k as a cubic in humidity, so the
+# 16-term polynomial collapses to nested Horner evaluation in H and then T.
+# The original formula uses (H / 100) ** 3 for its cubic humidity terms, which
+# is folded into the last column as a 1e-6 scale.
+_HEAT_INDEX_COEFFS = (
+    (16.923, 5.37941, 0.00728898, 0.0000291583 * 1e-6),
+    (0.185212, -0.100254, -0.000814971, 0.000000197483 * 1e-6),
+    (0.00941695, 0.000345372, 0.0000102102, 0.000000000843296 * 1e-6),
+    (-0.000038646, 0.00000142721, -0.0000000218429, -0.0000000000481975 * 1e-6),
+)
+
+
+def heat_index(temp_f, humidity):
+    """Heat index in F for scalars or NumPy arrays of temperature/humidity."""
+    if not (np.isscalar(temp_f) and np.isscalar(humidity)):
+        temp_f = np.asarray(temp_f, dtype=float)
+        humidity = np.asarray(humidity, dtype=float)
+
+    a0, a1, a2, a3 = (
+        c0 + humidity * (c1 + humidity * (c2 + humidity * c3))
+        for c0, c1, c2, c3 in _HEAT_INDEX_COEFFS
+    )
+    return a0 + temp_f * (a1 + temp_f * (a2 + temp_f * a3))
 
 
 # Displays
-class HeatIndexDisplay(Display, Observer):
+class HeatIndexDisplay(Display, MeasurementsObserver):
     _wd: "WeatherData"
     _temp_f: float
     _pressure: float
     _humidity: float
     _heat_index: float
+    # One per sample of the last update; a batch is computed in one go
+    _heat_indexes: np.ndarray
 
-    def __init__(self, wd: "WeatherData"):
+    def __init__(self, wd: "WeatherData" = None):
         self._wd = wd
-        self._wd.register_observer(self)
+        if wd is not None:
+            wd.register_observer(self)
+
+    def update_from(self, source: "Measurements", batch: bool = False):
+        self._temp_f = source.get_temp()
+        self._pressure = source.get_pressure()
+        self._humidity = source.get_humidity()
+
+        if batch:
+            heat_indexes = heat_index(source.get_temps(), source.get_humidities())
+        else:
+            heat_indexes = np.array(
+                [heat_index(self._temp_f, self._humidity)], dtype=float
+            )
+        self._set_heat_indexes(heat_indexes)
 
-    def update(self):
-        self._temp_f = self._wd.get_temp()
-        self._pressure = self._wd.get_pressure()
-        self._humidity = self._wd.get_humidity()
-
-        T2 = pow(self._temp_f, 2)
-        H2 = pow(self._humidity, 2)
-        T3 = pow(self._temp_f, 3)
-        H3 = pow(self._humidity / 100, 3)
-
-        # Coefficients for the calculations
-        C3 = [
-            16.923,
-            0.185212,
-            5.37941,
-            -0.100254,
-            0.00941695,
-            0.00728898,
-            0.000345372,
-            -0.000814971,
-            0.0000102102,
-            -0.000038646,
-            0.0000291583,
-            0.00000142721,
-            0.000000197483,
-            -0.0000000218429,
-            0.000000000843296,
-            -0.0000000000481975,
-        ]
+        self.display()
 
-        # Calculating heat-indexes with 3 different formula
-        self._heat_index = (
-            C3[0]
-            + (C3[1] * self._temp_f)
-            + (C3[2] * self._humidity)
-            + (C3[3] * self._temp_f * self._humidity)
-            + (C3[4] * T2)
-            + (C3[5] * H2)
-            + (C3[6] * T2 * self._humidity)
-            + (C3[7] * self._temp_f * H2)
-            + (C3[8] * T2 * H2)
-            + (C3[9] * T3)
-            + (C3[10] * H3)
-            + (C3[11] * T3 * self._humidity)
-            + (C3[12] * self._temp_f * H3)
-            + (C3[13] * T3 * H2)
-            + (C3[14] * T2 * H3)
-            + (C3[15] * T3 * H3)
-        )
+    def _set_heat_indexes(self, heat_indexes: np.ndarray):
+        self._heat_indexes = heat_indexes
+        self._heat_index = float(heat_indexes[-1])
 
-        self.display()
+    def get_heat_index(self) -> float:
+        return self._heat_index
+
+    def get_heat_indexes(self) -> np.ndarray:
+        return self._heat_indexes
 
     def display(self):
         print(f"Heat index is {self._heat_index}")
@@ -230,9 +724,12 @@ if __name__ == "__main__":
     statistics_display = StatisticsDisplay(wd)
     forecast_display = ForecastDisplay(wd)
     heat_index_display = HeatIndexDisplay(wd)
+    temperature_change_display = TemperatureChangeDisplay(wd)
 
     wd.set_measurements(80, 30.4, 65)
     time.sleep(1)
     wd.set_measurements(82, 29.2, 70)
     time.sleep(1)
     wd.set_measurements(78, 29.2, 90)
+    time.sleep(1)
+    wd.set_measurements_batch([80, 81, 83], [30.1, 30.0, 29.8], [60, 65, 72])
@@ -0,0 +1,103 @@
+import inspect
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from Starbuzz import *
+
+# Bulk pricing
+#
+# An order is three integers and a row of counts: base id, size id, and how
+# many of each condiment it has. Prices come from the Beverage classes
+# themselves, already in integer cents, so a batch of orders is priced
+# with one gather and one matrix product and no per-order objects.
+
+
+def concrete_subclasses(cls: type) -> List[type]:
+    found = []
+    for sub in cls.__subclasses__():
+        if not inspect.isabstract(sub):
+            found.append(sub)
+        found.extend(concrete_subclasses(sub))
+    return found
+
+
+class BulkPricer:
+    bases: List[type]
+    condiments: List[type]
+    sizes: List[Beverage.Size]
+    base_cents: np.ndarray  # [base]
+    condiment_cents: np.ndarray  # [size, condiment]
+
+    def __init__(self, bases: Sequence[type] = None, condiments: Sequence[type] = None):
+        if condiments is None:
+            condiments = concrete_subclasses(CondimentDecorator)
+        if bases is None:
+            bases = [
+                cls
+                for cls in concrete_subclasses(Beverage)
+                if not issubclass(cls, (CondimentDecorator, CompiledBeverage))
+            ]
+        self.bases = list(bases)
+        self.condiments = list(condiments)
+        self.sizes = list(Beverage.Size)
+        self._base_ids = {cls: i for i, cls in enumerate(self.bases)}
+        self._condiment_ids = {cls: i for i, cls in enumerate(self.condiments)}
+        self.refresh()
+
+    def refresh(self):
+        """Re-derive the price tables from the classes (after a price change)."""
+        self.base_cents = np.array(
+            [cls().cost_cents() for cls in self.bases], dtype=np.int64
+        )
+        # The condiments' own (size x price) rows, transposed to [size, condiment]
+        self.condiment_cents = np.array(
+            [cls.prices_cents for cls in self.condiments], dtype=np.int64
+        ).T.copy()
+
+    def encode(
+        self, beverages: Sequence[Beverage]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(base_ids, size_ids, counts) for existing drinks; mainly for checking."""
+        n = len(beverages)
+        base_ids = np.empty(n, dtype=np.int64)
+        size_ids = np.empty(n, dtype=np.int64)
+        counts = np.zeros((n, len(self.condiments)), dtype=np.int64)
+        for row, beverage in enumerate(beverages):
+            base, condiments = flatten(beverage)
+            base_ids[row] = self._base_ids[type(base)]
+            size_ids[row] = beverage.get_size().value
+            for cls, n in condiments.items():
+                counts[row, self._condiment_ids[cls]] += n
+        return base_ids, size_ids, counts
+
+    def price_cents(
+        self, base_ids: np.ndarray, size_ids: np.ndarray, counts: np.ndarray
+    ) -> np.ndarray:
+        """Exact order totals in integer cents."""
+        counts = np.asarray(counts, dtype=np.int64)
+        totals = self.base_cents[base_ids]
+        # Sum over condiments of count * price-at-that-size, per order
+        totals += np.einsum("ij,ij->i", counts, self.condiment_cents[size_ids])
+        return totals
+
+    def price(
+        self, base_ids: np.ndarray, size_ids: np.ndarray, counts: np.ndarray
+    ) -> np.ndarray:
+        """Order totals in dollars; equal to beverage.cost()."""
+        return self.price_cents(base_ids, size_ids, counts) / 100
+
+
+if __name__ == "__main__":
+    import time
+
+    pricer = BulkPricer()
+    n = 10_000_000
+    rng = np.random.default_rng(0)
+    base_ids = rng.integers(0, len(pricer.bases), n)
+    size_ids = rng.integers(0, len(pricer.sizes), n)
+    counts = rng.integers(0, 3, (n, len(pricer.condiments)))
+
+    start = time.perf_counter()
+    totals = pricer.price_cents(base_ids, size_ids, counts)
+    elapsed = time.perf_counter() - start
+    print(f"Priced {n:,} orders in {elapsed:.2f}s, total ${totals.sum() / 100:,.2f}")
@@ -0,0 +1,61 @@
+import argparse
+import time
+
+from MemoryBenchmark import make_drink
+from Starbuzz import *
+
+# Price cache benchmark
+#
+# Prices `calls` drinks drawn round-robin from `configs` configurations of
+# `condiments` layers each, the way a POS reprices the same few hundred
+# menu items over and over: building each decorator chain and pricing it,
+# through the PriceCache from the raw configuration (canonicalized on every
+# call), and through the PriceCache with keys made once up front.
+
+
+def time_calls(price, items: list, calls: int) -> float:
+    n = len(items)
+    start = time.perf_counter()
+    for i in range(calls):
+        price(items[i % n])
+    return time.perf_counter() - start
+
+
+def measure(calls: int, configs: int, condiments: int) -> dict:
+    menu = []
+    for i in range(configs):
+        base, counts = flatten(make_drink(i, condiments))
+        menu.append((type(base), counts, base.get_size()))
+    keys = [PriceCache.make_key(*item) for item in menu]
+    cache = PriceCache(configs)
+    for i, key in enumerate(keys):
+        assert cache.lookup_cents(key) == make_drink(i, condiments).cost_cents()
+
+    return {
+        "build chain": time_calls(
+            lambda i: make_drink(i, condiments).cost(), range(configs), calls
+        ),
+        "cache, config": time_calls(lambda item: cache.price(*item), menu, calls),
+        "cache, key": time_calls(cache.lookup, keys, calls),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time cached and uncached pricing")
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--configs", type=int, default=300)
+    parser.add_argument("--condiments", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = measure(args.calls, args.configs, args.condiments)
+    baseline = timings["build chain"]
+    print(
+        f"{args.calls:,} prices over {args.configs} configurations "
+        f"of {args.condiments} condiments:"
+    )
+    for label, elapsed in timings.items():
+        print(f"  {label:<16} {elapsed:.3f}s ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
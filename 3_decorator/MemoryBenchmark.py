@@ -0,0 +1,51 @@
+import argparse
+import gc
+import tracemalloc
+
+from Starbuzz import *
+
+# Memory benchmark for decorated beverages
+#
+# Builds `drinks` drinks of `condiments` layers each, keeps them all alive,
+# and reports the heap they take per drink as seen by tracemalloc (the list
+# holding them is left out).
+
+BASES = (Espresso, HouseBlend, DarkRoast, Decaf)
+CONDIMENTS = (Mocha, Soy, Whip)
+
+
+def make_drink(i: int, condiments: int) -> Beverage:
+    beverage: Beverage = BASES[i % len(BASES)]()
+    beverage.set_size(Beverage.Size((i // len(BASES)) % len(Beverage.Size)))
+    for k in range(condiments):
+        beverage = CONDIMENTS[(i + k) % len(CONDIMENTS)](beverage)
+    return beverage
+
+
+def measure(drinks: int, condiments: int) -> float:
+    holder = [None] * drinks
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(drinks):
+        holder[i] = make_drink(i, condiments)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / drinks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure bytes per decorated drink")
+    parser.add_argument("--drinks", type=int, default=100000)
+    parser.add_argument("--condiments", type=int, default=5)
+    args = parser.parse_args()
+
+    per_drink = measure(args.drinks, args.condiments)
+    print(
+        f"{args.drinks:,} drinks with {args.condiments} condiments: "
+        f"{per_drink:,.1f} bytes per drink"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import argparse
+import collections
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+from BulkPricing import BulkPricer
+from Starbuzz import *
+
+# Order processing
+#
+# Each store uploads a log with one order per line, e.g.
+#
+#     DarkRoast VENTI Mocha Mocha Whip
+#
+# that is, a base class name, an optional size (TALL if omitted) and any
+# number of condiment class names. The store is named after the file. Lines
+# are read in chunks, and each chunk is parsed and priced in a worker process
+# with BulkPricer, so no Beverage objects are built.
+
+
+class OrderRegistry:
+    """Name -> id lookups for every base, condiment and size BulkPricer knows."""
+
+    pricer: BulkPricer
+    bases: Dict[str, int]
+    condiments: Dict[str, int]
+    sizes: Dict[str, int]
+    base_descriptions: List[str]
+    condiment_names: List[str]
+
+    def __init__(self, pricer: BulkPricer = None):
+        self.pricer = pricer or BulkPricer()
+        self.bases = {cls.__name__: i for i, cls in enumerate(self.pricer.bases)}
+        self.condiments = {
+            cls.__name__: i for i, cls in enumerate(self.pricer.condiments)
+        }
+        self.sizes = {size.name: size.value for size in Beverage.Size}
+        self.base_descriptions = [cls().get_description() for cls in self.pricer.bases]
+        self.condiment_names = [cls.name for cls in self.pricer.condiments]
+
+    def parse(
+        self, lines: List[str]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[int], list]:
+        """Encode lines for BulkPricer.
+
+        Returns the id arrays plus the index of each encoded line in `lines`
+        and a list of (line, error) pairs for lines that were skipped.
+        """
+        n = len(lines)
+        base_ids = np.empty(n, dtype=np.int64)
+        size_ids = np.empty(n, dtype=np.int64)
+        counts = np.zeros((n, len(self.condiments)), dtype=np.int64)
+        accepted = []
+        rejected = []
+        row = 0
+        for i, line in enumerate(lines):
+            tokens = line.split()
+            if not tokens:
+                continue
+            try:
+                base_ids[row] = self.bases[tokens[0]]
+                rest = tokens[1:]
+                if rest and rest[0] in self.sizes:
+                    size_ids[row] = self.sizes[rest[0]]
+                    rest = rest[1:]
+                else:
+                    size_ids[row] = Beverage.Size.TALL.value
+                counts[row] = 0
+                for name in rest:
+                    counts[row, self.condiments[name]] += 1
+            except KeyError as e:
+                rejected.append((line.rstrip("\n"), f"unknown name {e}"))
+                continue
+            accepted.append(i)
+            row += 1
+        return base_ids[:row], size_ids[:row], counts[:row], accepted, rejected
+
+    def receipt(self, line: str, cents: int) -> str:
+        """Receipt text for a line that parse() accepted."""
+        tokens = line.split()
+        rest = tokens[1:]
+        if rest and rest[0] in self.sizes:
+            rest = rest[1:]
+        base = self.base_descriptions[self.bases[tokens[0]]]
+        names = [self.condiment_names[self.condiments[t]] for t in rest]
+        return f"{join_description(base, names, compact=True)} ${cents / 100:.2f}"
+
+
+_registry: OrderRegistry = None
+
+
+def price_chunk(lines: List[str], receipts: bool) -> dict:
+    """Worker entry point: price one chunk of order lines."""
+    global _registry
+    if _registry is None:
+        _registry = OrderRegistry()
+
+    base_ids, size_ids, counts, accepted, rejected = _registry.parse(lines)
+    cents = _registry.pricer.price_cents(base_ids, size_ids, counts)
+    result = {
+        "orders": int(cents.size),
+        "total_cents": int(cents.sum()),
+        "rejected": rejected,
+    }
+    if receipts:
+        result["receipts"] = [
+            _registry.receipt(lines[i], int(c)) for i, c in zip(accepted, cents)
+        ]
+    return result
+
+
+def read_chunks(path: str, chunk_size: int) -> Iterator[List[str]]:
+    with open(path) as f:
+        while True:
+            chunk = list(itertools.islice(f, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def store_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def process_files(
+    paths: List[str],
+    executor: Executor,
+    chunk_size: int = 50000,
+    receipts=None,
+    max_in_flight: int = None,
+) -> Dict[str, dict]:
+    """Price every order in paths and return per-store totals.
+
+    Chunks are submitted with a bounded number in flight so memory stays
+    flat however large the files are. Results are consumed in submission
+    order, so the receipt stream matches the input order.
+    """
+    if max_in_flight is None:
+        max_in_flight = 2 * (os.cpu_count() or 1)
+
+    totals: Dict[str, dict] = {}
+    in_flight = collections.deque()
+
+    def collect(store: str, future):
+        result = future.result()
+        store_totals = totals.setdefault(
+            store, {"orders": 0, "total_cents": 0, "rejected": 0}
+        )
+        store_totals["orders"] += result["orders"]
+        store_totals["total_cents"] += result["total_cents"]
+        store_totals["rejected"] += len(result["rejected"])
+        for line, error in result["rejected"]:
+            print(f"{store}: rejected {line!r}: {error}", file=sys.stderr)
+        if receipts is not None:
+            for receipt in result["receipts"]:
+                receipts.write(f"{store}\t{receipt}\n")
+
+    for path in paths:
+        store = store_name(path)
+        for chunk in read_chunks(path, chunk_size):
+            if len(in_flight) >= max_in_flight:
+                collect(*in_flight.popleft())
+            in_flight.append(
+                (store, executor.submit(price_chunk, chunk, receipts is not None))
+            )
+    while in_flight:
+        collect(*in_flight.popleft())
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price Starbuzz store order logs")
+    parser.add_argument("paths", nargs="+", help="one order log per store")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--receipts", help="write a receipt line per order here")
+    args = parser.parse_args()
+
+    receipts = open(args.receipts, "w") if args.receipts else None
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(args.workers) as executor:
+            totals = process_files(args.paths, executor, args.chunk_size, receipts)
+    finally:
+        if receipts is not None:
+            receipts.close()
+    elapsed = time.perf_counter() - start
+
+    orders = 0
+    for store, store_totals in sorted(totals.items()):
+        orders += store_totals["orders"]
+        print(
+            f"{store}: {store_totals['orders']} orders, "
+            f"${store_totals['total_cents'] / 100:,.2f}, "
+            f"{store_totals['rejected']} rejected"
+        )
+    print(f"Priced {orders:,} orders in {elapsed:.2f}s ({orders / elapsed:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
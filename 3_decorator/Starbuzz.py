@@ -1,14 +1,23 @@
+import sys
 from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
 from enum import Enum
+from typing import Dict, List, Sequence, Tuple
 
 # Base classes
 
 
 class Beverage(ABC):
     class Size(Enum):
-        TALL = (1,)
-        GRANDE = (2,)
-        VENTI = 3
+        # Dense codes, so a size indexes straight into price tables
+        TALL = 0
+        GRANDE = 1
+        VENTI = 2
+
+    # No per-instance __dict__ anywhere in the hierarchy: each class lists
+    # the attributes it stores, and constant ones such as a base's
+    # description are class attributes shared by every instance
+    __slots__ = ()
 
     description: str = "Unknown Beverage"
     size: Size = Size.TALL
@@ -16,102 +25,419 @@ class Beverage(ABC):
     def get_description(self) -> str:
         return self.description
 
+    def get_compact_description(self) -> str:
+        return self.get_description()
+
     def set_size(self, size: Size):
         self.size = size
 
     def get_size(self) -> Size:
         return self.size
 
+    # Prices are kept in integer cents so totals are exact; cost() is the
+    # dollar view of the same number
     @abstractmethod
-    def cost(self) -> float:
+    def cost_cents(self) -> int:
         raise NotImplementedError
 
+    def cost(self) -> float:
+        return self.cost_cents() / 100
+
 
 class CondimentDecorator(Beverage):
+    __slots__ = ("beverage",)
+
     beverage: Beverage
+    name: str
+    # One price in cents per Beverage.Size, indexed by Size.value
+    prices_cents: Tuple[int, ...]
+
+    # A condiment's price is its prices_cents row and nothing else: the
+    # chain, CompiledBeverage, PriceCache and BulkPricer all add those rows
+    # up per condiment, so a class that priced itself some other way would
+    # cost differently depending on which of them priced it
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for attr in ("cost", "cost_cents"):
+            if attr in cls.__dict__:
+                raise TypeError(
+                    f"{cls.__name__} must be priced through prices_cents, "
+                    f"not by overriding {attr}"
+                )
+        # Abstract intermediate classes may leave the concrete ones to fill in
+        if any(
+            getattr(getattr(cls, attr, None), "__isabstractmethod__", False)
+            for attr in dir(cls)
+        ):
+            return
+        for attr in ("name", "prices_cents"):
+            if not hasattr(cls, attr):
+                raise TypeError(f"{cls.__name__} must define {attr}")
+        prices = cls.prices_cents
+        if len(prices) != len(Beverage.Size):
+            raise TypeError(
+                f"{cls.__name__}.prices_cents needs one entry per Beverage.Size"
+            )
+        if not all(isinstance(price, int) for price in prices):
+            raise TypeError(f"{cls.__name__}.prices_cents must be integer cents")
 
-    @abstractmethod
     def get_description(self) -> str:
-        raise NotImplementedError
+        return build_description(self)
+
+    def get_compact_description(self) -> str:
+        return build_description(self, compact=True)
+
+    # Size belongs to the drink, so every layer reports the base's size.
+    # The base is found by walking down, so deep chains don't recurse.
+    def set_size(self, size: Beverage.Size):
+        base_of(self).set_size(size)
+
+    def get_size(self) -> Beverage.Size:
+        return base_of(self).get_size()
+
+    def cost_cents(self) -> int:
+        # Look the size up once for the whole chain rather than once per layer
+        base, layers = unwrap(self)
+        size = base.get_size().value
+        total = base.cost_cents()
+        for layer in layers:
+            total += layer.prices_cents[size]
+        return total
+
+    def condiment_cost_cents(self) -> int:
+        return self.prices_cents[base_of(self).get_size().value]
+
+    def condiment_cost(self) -> float:
+        return self.condiment_cost_cents() / 100
+
+
+# Descriptions
+
+
+def base_of(beverage: Beverage) -> Beverage:
+    """The innermost beverage of a decorator chain."""
+    while isinstance(beverage, CondimentDecorator):
+        beverage = beverage.beverage
+    return beverage
+
+
+def unwrap(beverage: Beverage) -> Tuple[Beverage, List[CondimentDecorator]]:
+    """Split a decorator chain into its base and its condiments, innermost first."""
+    layers: List[CondimentDecorator] = []
+    while isinstance(beverage, CondimentDecorator):
+        layers.append(beverage)
+        beverage = beverage.beverage
+    layers.reverse()
+    return beverage, layers
+
+
+def build_description(beverage: Beverage, compact: bool = False) -> str:
+    """Describe a drink with one join instead of one concatenation per layer.
+
+    A CompiledBeverage base is looked through as in flatten(): its
+    condiments come first, then the layers served on top of it.
+    """
+    base, layers = unwrap(beverage)
+    names = [layer.name for layer in layers]
+    if isinstance(base, CompiledBeverage):
+        names = list(base.names) + names
+        base = base.base
+    return join_description(base.get_description(), names, compact)
+
+
+def join_description(base: str, names: Sequence[str], compact: bool = False) -> str:
+    """Join a base description and condiment names, innermost first.
+
+    The compact form counts repeated condiments in order of first use, e.g.
+    "Dark Roast Coffee, Mocha x2, Whip", for receipts.
+    """
+    if compact:
+        names = [
+            name if count == 1 else f"{name} x{count}"
+            for name, count in Counter(names).items()
+        ]
+    return ", ".join([base, *names])
 
 
 # Beverages
 
 
 class Espresso(Beverage):
+    __slots__ = ("size",)
+    description = sys.intern("Espresso")
+
     def __init__(self):
-        self.description = "Espresso"
+        self.size = Beverage.Size.TALL
 
-    def cost(self) -> float:
-        return 1.99
+    def cost_cents(self) -> int:
+        return 199
 
 
 class HouseBlend(Beverage):
+    __slots__ = ("size",)
+    description = sys.intern("House Blend Coffee")
+
     def __init__(self):
-        self.description = "House Blend Coffee"
+        self.size = Beverage.Size.TALL
 
-    def cost(self) -> float:
-        return 0.89
+    def cost_cents(self) -> int:
+        return 89
 
 
 class DarkRoast(Beverage):
+    __slots__ = ("size",)
+    description = sys.intern("Dark Roast Coffee")
+
     def __init__(self):
-        self.description = "Dark Roast Coffee"
+        self.size = Beverage.Size.TALL
 
-    def cost(self) -> float:
-        return 0.99
+    def cost_cents(self) -> int:
+        return 99
 
 
 class Decaf(Beverage):
+    __slots__ = ("size",)
+    description = sys.intern("Decaf Coffee")
+
     def __init__(self):
-        self.description = "Decaf Coffee"
+        self.size = Beverage.Size.TALL
 
-    def cost(self) -> float:
-        return 1.05
+    def cost_cents(self) -> int:
+        return 105
 
 
 # Condiments
 
 
 class Mocha(CondimentDecorator):
+    __slots__ = ()
+    name = "Mocha"
+    prices_cents = (20, 20, 20)
+
     def __init__(self, beverage: Beverage):
         self.beverage = beverage
 
-    def get_description(self) -> str:
-        return self.beverage.get_description() + ", Mocha"
 
-    def cost(self) -> float:
-        return self.beverage.cost() + 0.20
+class Soy(CondimentDecorator):
+    __slots__ = ()
+    name = "Soy"
+    prices_cents = (10, 15, 20)
 
+    def __init__(self, beverage: Beverage):
+        self.beverage = beverage
+
+
+class Whip(CondimentDecorator):
+    __slots__ = ()
+    name = "Whip"
+    prices_cents = (10, 10, 10)
 
-class Soy(CondimentDecorator):
     def __init__(self, beverage: Beverage):
         self.beverage = beverage
 
-    def get_description(self) -> str:
-        return self.beverage.get_description() + ", Soy"
 
-    def cost(self) -> float:
-        adder = 0.15
-        if self.beverage.get_size() == Beverage.Size.TALL:
-            adder = 0.10
-        elif self.beverage.get_size() == Beverage.Size.GRANDE:
-            adder = 0.15
-        elif self.beverage.get_size() == Beverage.Size.VENTI:
-            adder = 0.20
+# Compiled beverages
 
-        return self.beverage.cost() + adder
 
+class CompiledBeverage(Beverage):
+    """A decorator chain flattened into its base, condiment counts and size.
 
-class Whip(CondimentDecorator):
-    def __init__(self, beverage: Beverage):
-        self.beverage = beverage
+    Compiling walks the chain once, iteratively, and keeps only the base,
+    the condiment counts, the condiment names in serving order, the size and
+    the descriptions; the chain itself is not held on to. Prices are summed
+    in cents, so the result matches the chain's cost_cents() exactly, and
+    set_size() reprices from the counts without touching the original drink.
+    """
 
-    def get_description(self) -> str:
-        return self.beverage.get_description() + ", Whip"
+    __slots__ = (
+        "base",
+        "condiments",
+        "names",
+        "description",
+        "size",
+        "_cost_cents",
+        "_compact_description",
+    )
 
-    def cost(self) -> float:
-        return self.beverage.cost() + 0.10
+    base: Beverage
+    condiments: Dict[type, int]
+    names: Tuple[str, ...]
+    _cost_cents: int
+    _compact_description: str
+
+    def __init__(self, beverage: Beverage):
+        self.base, self.condiments = flatten(beverage)
+        # Counts lose the serving order, so descriptions of drinks built on
+        # top of this one are made from the names instead
+        base, layers = unwrap(beverage)
+        names = [layer.name for layer in layers]
+        if isinstance(base, CompiledBeverage):
+            names = list(base.names) + names
+        self.names = tuple(sys.intern(name) for name in names)
+        self.size = beverage.get_size()
+        # Interned, so compiled copies of one configuration share their strings
+        self.description = sys.intern(
+            join_description(self.base.get_description(), self.names)
+        )
+        self._compact_description = sys.intern(
+            join_description(self.base.get_description(), self.names, compact=True)
+        )
+        self._price()
+
+    def _price(self):
+        total = self.base.cost_cents()
+        for cls, n in self.condiments.items():
+            total += n * cls.prices_cents[self.size.value]
+        self._cost_cents = total
+
+    def set_size(self, size: Beverage.Size):
+        self.size = size
+        self._price()
+
+    def get_compact_description(self) -> str:
+        return self._compact_description
+
+    def cost_cents(self) -> int:
+        return self._cost_cents
+
+
+def flatten(beverage: Beverage) -> Tuple[Beverage, Dict[type, int]]:
+    """A drink's base and condiment counts, in order of first use.
+
+    Compiled beverages are looked through as well, so the base is always a
+    plain beverage even for condiments added on top of a CompiledBeverage.
+    """
+    base, layers = unwrap(beverage)
+    counts = Counter(type(layer) for layer in layers)
+    if isinstance(base, CompiledBeverage):
+        counts = Counter(base.condiments) + counts
+        base = base.base
+    return base, dict(counts)
+
+
+def canonical_condiments(counts: Dict[type, int]) -> Tuple[Tuple[type, int], ...]:
+    """Condiment counts as a sorted tuple, the same for any serving order."""
+    return tuple(
+        sorted(
+            ((cls, n) for cls, n in counts.items() if n),
+            key=lambda item: item[0].__qualname__,
+        )
+    )
+
+
+# Price cache
+
+
+class PriceCache:
+    """LRU cache of prices keyed by canonical drink configuration.
+
+    The key is (base class, sorted condiment multiset, size), so any
+    ordering of the same condiments shares an entry, however it was given:
+    a {class: count} dict, an iterable of condiment classes (one per
+    serving) or of (class, count) pairs. Prices are cached in integer
+    cents, so they do not depend on the order they were summed in. Prices
+    live in code, so call invalidate() after changing one.
+
+    Canonicalizing a configuration costs about as much as pricing it, so a
+    POS should make_key() each menu item once, keep the key, and reprice
+    it with lookup_cents(), which is a single dict hit. price_cents() does
+    both steps per call, for configurations that are not seen again.
+    """
+
+    ConfigKey = Tuple[type, Tuple[Tuple[type, int], ...], Beverage.Size]
+
+    maxsize: int
+    hits: int
+    misses: int
+    _prices: "OrderedDict[ConfigKey, int]"
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._prices = OrderedDict()
+
+    @staticmethod
+    def make_key(base: type, condiments, size: Beverage.Size) -> "PriceCache.ConfigKey":
+        if not isinstance(base, type) or issubclass(
+            base, (CondimentDecorator, CompiledBeverage)
+        ):
+            raise TypeError(f"{base!r} is not a base beverage class")
+
+        if isinstance(condiments, dict):
+            items = condiments.items()
+        else:
+            items = Counter()
+            for item in condiments:
+                if isinstance(item, tuple):
+                    cls, n = item
+                    items[cls] += n
+                else:
+                    items[item] += 1
+            items = items.items()
+
+        counts = Counter()
+        for cls, n in items:
+            if not (isinstance(cls, type) and issubclass(cls, CondimentDecorator)):
+                raise TypeError(f"{cls!r} is not a condiment class")
+            counts[cls] += n
+        return base, canonical_condiments(counts), size
+
+    def price(
+        self, base: type, condiments, size: Beverage.Size = Beverage.Size.TALL
+    ) -> float:
+        return self.price_cents(base, condiments, size) / 100
+
+    def price_cents(
+        self, base: type, condiments, size: Beverage.Size = Beverage.Size.TALL
+    ) -> int:
+        """Price a configuration without building it."""
+        return self.lookup_cents(self.make_key(base, condiments, size))
+
+    def lookup(self, key: "PriceCache.ConfigKey") -> float:
+        return self.lookup_cents(key) / 100
+
+    def lookup_cents(self, key: "PriceCache.ConfigKey") -> int:
+        """Price a key from make_key(); keys are not checked again."""
+        price = self._prices.get(key)
+        if price is not None:
+            self.hits += 1
+            self._prices.move_to_end(key)
+            return price
+
+        price = self._compute(key)
+        self.misses += 1
+        self._prices[key] = price
+        if len(self._prices) > self.maxsize:
+            self._prices.popitem(last=False)
+        return price
+
+    @staticmethod
+    def _compute(key: "PriceCache.ConfigKey") -> int:
+        base, condiments, size = key
+        total = base().cost_cents()
+        for cls, n in condiments:
+            total += n * cls.prices_cents[size.value]
+        return total
+
+    def invalidate(self, cls: type = None):
+        """Drop entries that use cls as base or condiment; None drops all."""
+        if cls is None:
+            self._prices.clear()
+            return
+        stale = [
+            key
+            for key in self._prices
+            if key[0] is cls or any(c is cls for c, _ in key[1])
+        ]
+        for key in stale:
+            del self._prices[key]
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._prices)}
 
 
 # test
@@ -131,3 +457,13 @@ if __name__ == "__main__":
     beverage3 = Mocha(beverage3)
     beverage3 = Whip(beverage3)
     print(beverage3.get_description() + " $" + str(beverage3.cost()))
+
+    compiled: Beverage = CompiledBeverage(beverage2)
+    print(compiled.get_description() + " $" + str(compiled.cost()))
+    print(compiled.get_compact_description() + " $" + str(compiled.cost()))
+
+    cache = PriceCache()
+    key = cache.make_key(DarkRoast, [Mocha, Mocha, Whip], Beverage.Size.TALL)
+    for _ in range(3):
+        cache.lookup(key)
+    print(cache.price(DarkRoast, {Whip: 1, Mocha: 2}), cache.stats())
@@ -0,0 +1,76 @@
+import argparse
+import contextlib
+import gc
+import io
+import sys
+import time
+import tracemalloc
+
+from Pizza import *
+
+# Allocation benchmark for pizza orders
+#
+# Creates and prepares `orders` pizzas, cycling through every type on the
+# store's menu, and keeps them all alive. The heap blocks and bytes still
+# allocated afterwards, divided by the order count, are what each order
+# leaves behind: the pizza itself plus whatever factories and ingredients
+# it was built from. Timing runs separately, since tracemalloc slows it.
+
+STORES = {"ny": NYPizzaStore, "chicago": ChicagoPizzaStore}
+
+
+def make_orders(store: PizzaStore, orders: int) -> list:
+    types = sorted(store.menu)
+    pizzas = [None] * orders
+    for i in range(orders):
+        pizza = store.create_pizza(types[i % len(types)])
+        pizza.prepare()
+        pizzas[i] = pizza
+    return pizzas
+
+
+def measure(store: PizzaStore, orders: int) -> dict:
+    # prepare() prints; keep that out of both the timings and the heap
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        start = time.perf_counter()
+        make_orders(store, orders)
+        elapsed = time.perf_counter() - start
+
+        gc.collect()
+        out.seek(0)
+        out.truncate()
+        blocks = sys.getallocatedblocks()
+        tracemalloc.start()
+        pizzas = make_orders(store, orders)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        out.seek(0)
+        out.truncate()
+        gc.collect()
+        blocks = sys.getallocatedblocks() - blocks
+        del pizzas
+
+    return {
+        "blocks_per_order": blocks / orders,
+        "bytes_per_order": size / orders,
+        "orders_per_second": orders / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure allocations per order")
+    parser.add_argument("--store", choices=sorted(STORES), default="ny")
+    parser.add_argument("--orders", type=int, default=100000)
+    args = parser.parse_args()
+
+    result = measure(STORES[args.store](), args.orders)
+    print(
+        f"{args.orders:,} {args.store} orders: "
+        f"{result['blocks_per_order']:.1f} blocks, "
+        f"{result['bytes_per_order']:,.1f} bytes per order, "
+        f"{result['orders_per_second']:,.0f} orders/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,123 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, NamedTuple, Tuple
+
+# Ingredients
+
+
+class Ingredient(ABC):
+    """Ingredients are immutable and stateless, so they are flyweights.
+
+    Calling an ingredient class returns that class's one shared instance,
+    and instances refuse attribute assignment, so sharing them is safe.
+    """
+
+    _instances: Dict[type, "Ingredient"] = {}
+
+    name: str
+
+    def __new__(cls):
+        instance = Ingredient._instances.get(cls)
+        if instance is None:
+            instance = Ingredient._instances[cls] = super().__new__(cls)
+        return instance
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class Dough(Ingredient):
+    pass
+
+
+class Sauce(Ingredient):
+    pass
+
+
+class Cheese(Ingredient):
+    pass
+
+
+class Veggies(Ingredient):
+    pass
+
+
+class Pepperoni(Ingredient):
+    pass
+
+
+class Clam(Ingredient):
+    pass
+
+
+class ThinCrustDough(Dough):
+    name = "Thin Crust Dough"
+
+
+class ThickCrustDough(Dough):
+    name = "Extra Thick Crust Dough"
+
+
+class MarinaraSauce(Sauce):
+    name = "Marinara Sauce"
+
+
+class PlumTomatoSauce(Sauce):
+    name = "Plum Tomato Sauce"
+
+
+class ReggianoCheese(Cheese):
+    name = "Grated Reggiano Cheese"
+
+
+class MozzarellaCheese(Cheese):
+    name = "Shredded Mozzarella Cheese"
+
+
+class Garlic(Veggies):
+    name = "Garlic"
+
+
+class Onion(Veggies):
+    name = "Onion"
+
+
+class Mushroom(Veggies):
+    name = "Mushrooms"
+
+
+class RedPepper(Veggies):
+    name = "Red Pepper"
+
+
+class Spinach(Veggies):
+    name = "Spinach"
+
+
+class BlackOlives(Veggies):
+    name = "Black Olives"
+
+
+class Eggplant(Veggies):
+    name = "Eggplant"
+
+
+class SlicedPepperoni(Pepperoni):
+    name = "Sliced Pepperoni"
+
+
+class FreshClams(Clam):
+    name = "Fresh Clams from Long Island Sound"
+
+
+class FrozenClams(Clam):
+    name = "Frozen Clams from Chesapeake Bay"
+
 
 # Pizzas
 
@@ -8,7 +126,7 @@ class Pizza(ABC):
     name: str
     dough: str
     sauce: str
-    veggies: List[Veggies]
+    veggies: Tuple[Veggies, ...]
     cheese: Cheese
     pepperoni: Pepperoni
     clams: Clam
@@ -21,7 +139,7 @@ class Pizza(ABC):
         print("Bake for 25 minutes at 350°F")
 
     def cut(self):
-        print("Cutting the pizza into diagnoal slices")
+        print("Cutting the pizza into diagonal slices")
 
     def box(self):
         print("Place pizza in official PizzaStore box")
@@ -34,9 +152,9 @@ class Pizza(ABC):
 
 
 class CheesePizza(Pizza):
-    ingredient_factory: PizzaIngredientFactory
+    ingredient_factory: "PizzaIngredientFactory"
 
-    def __init__(self, ingredient_factory: PizzaIngredientFactory):
+    def __init__(self, ingredient_factory: "PizzaIngredientFactory"):
         self.ingredient_factory = ingredient_factory
 
     def prepare(self):
@@ -48,9 +166,9 @@ class CheesePizza(Pizza):
 
 
 class ClamPizza(Pizza):
-    ingredient_factory: PizzaIngredientFactory
+    ingredient_factory: "PizzaIngredientFactory"
 
-    def __init__(self, ingredient_factory: PizzaIngredientFactory):
+    def __init__(self, ingredient_factory: "PizzaIngredientFactory"):
         self.ingredient_factory = ingredient_factory
 
     def prepare(self):
@@ -62,34 +180,122 @@ class ClamPizza(Pizza):
         self.clam = self.ingredient_factory.create_clam()
 
 
-class NYStyleCheesePizza(Pizza):
-    def __init__(self):
-        self.name = "NY Style Sauce and Cheese Pizza"
-        self.dough = "Thin Crust Dough"
-        self.sauce = "Marinara Sauce"
-        self.toppings = []
-        self.toppings.append("Grated Reggiano Cheese")
+class VeggiePizza(Pizza):
+    ingredient_factory: "PizzaIngredientFactory"
+
+    def __init__(self, ingredient_factory: "PizzaIngredientFactory"):
+        self.ingredient_factory = ingredient_factory
+
+    def prepare(self):
+        print(f"Preparing {self.get_name()}")
+
+        self.dough = self.ingredient_factory.create_dough()
+        self.sauce = self.ingredient_factory.create_sauce()
+        self.cheese = self.ingredient_factory.create_cheese()
+        self.veggies = self.ingredient_factory.create_veggies()
 
 
-class ChicagoStyleCheesePizza(Pizza):
-    def __init__(self):
-        self.name = "Chicago Style Deep Dish Cheese Pizza"
-        self.dough = "Extra Thick Crust Dough"
-        self.sauce = "Plum Tomato Sauce"
-        self.toppings = []
-        self.toppings.append("Shredded Mozzarella Cheese")
+class PepperoniPizza(Pizza):
+    ingredient_factory: "PizzaIngredientFactory"
+
+    def __init__(self, ingredient_factory: "PizzaIngredientFactory"):
+        self.ingredient_factory = ingredient_factory
+
+    def prepare(self):
+        print(f"Preparing {self.get_name()}")
+
+        self.dough = self.ingredient_factory.create_dough()
+        self.sauce = self.ingredient_factory.create_sauce()
+        self.cheese = self.ingredient_factory.create_cheese()
+        self.veggies = self.ingredient_factory.create_veggies()
+        self.pepperoni = self.ingredient_factory.create_pepperoni()
+
+
+# Regional styles
+
+
+class ChicagoStylePizza(Pizza):
+    """Deep dish: the same pizzas, cut into squares instead of wedges."""
 
     def cut(self):
         print("Cutting the pizza into square slices")
 
 
+class ChicagoStyleCheesePizza(ChicagoStylePizza, CheesePizza):
+    pass
+
+
+class ChicagoStyleVeggiePizza(ChicagoStylePizza, VeggiePizza):
+    pass
+
+
+class ChicagoStyleClamPizza(ChicagoStylePizza, ClamPizza):
+    pass
+
+
+class ChicagoStylePepperoniPizza(ChicagoStylePizza, PepperoniPizza):
+    pass
+
+
 # PizzaStore
 
 
+class MenuItem(NamedTuple):
+    pizza_class: type
+    name: str
+    ingredient_factory: "PizzaIngredientFactory"
+
+
 class PizzaStore(ABC):
-    @abstractmethod
+    """A store's pizzas come from its menu: type -> MenuItem.
+
+    Every store class has its own menu, so create_pizza is one dict lookup
+    however many types a region sells, and plugins can add or replace types
+    at runtime with register(). Ingredient factories are stateless, so a
+    store builds one of each kind when it is registered and every order
+    shares it.
+    """
+
+    menu: Dict[str, MenuItem] = {}
+    ingredient_factories: Dict[type, "PizzaIngredientFactory"] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.menu = {}
+        cls.ingredient_factories = {}
+
+    @classmethod
+    def register(
+        cls, type: str, pizza_class: type, name: str, ingredient_factory: type
+    ):
+        if not issubclass(pizza_class, Pizza):
+            raise TypeError(f"{pizza_class.__name__} is not a Pizza")
+        if not issubclass(ingredient_factory, PizzaIngredientFactory):
+            raise TypeError(
+                f"{ingredient_factory.__name__} is not a PizzaIngredientFactory"
+            )
+        factory = cls.ingredient_factories.get(ingredient_factory)
+        if factory is None:
+            factory = cls.ingredient_factories[ingredient_factory] = (
+                ingredient_factory()
+            )
+        cls.menu[type] = MenuItem(pizza_class, name, factory)
+
+    @classmethod
+    def unregister(cls, type: str):
+        del cls.menu[type]
+
     def create_pizza(self, type: str) -> Pizza:
-        raise NotImplementedError
+        item = self.menu.get(type)
+        if item is None:
+            known = ", ".join(sorted(self.menu)) or "nothing"
+            raise ValueError(
+                f"{self.__class__.__name__} has no {type!r} pizza; it sells {known}"
+            )
+
+        pizza: Pizza = item.pizza_class(item.ingredient_factory)
+        pizza.set_name(item.name)
+        return pizza
 
     def order_pizza(self, type: str) -> Pizza:
         pizza: Pizza = self.create_pizza(type)
@@ -103,63 +309,15 @@ class PizzaStore(ABC):
 
 
 class NYPizzaStore(PizzaStore):
-    def create_pizza(self, type: str) -> Pizza:
-        pizza: Pizza
-        ingredient_factory: PizzaIngredientFactory = NYPizzaIngredientFactory()
-        if type == "cheese":
-            pizza = CheesePizza(ingredient_factory)
-            pizza.set_name("New York Style Cheese Pizza")
-            # pizza = NYStyleCheesePizza()
-        elif type == "veggie":
-            pizza = VeggiePizza(ingredient_factory)
-            pizza.set_name("New York Style Veggie Pizza")
-            # pizza = NYStyleVeggiePizza()
-        elif type == "clam":
-            pizza = ClamPizza(ingredient_factory)
-            pizza.set_name("New York Style Clam Pizza")
-            # pizza = NYStyleClamPizza()
-        elif type == "pepperoni":
-            pizza = PepperoniPizza(ingredient_factory)
-            pizza.set_name("New York Style Pepperoni Pizza")
-            # pizza = NYStylePepperoniPizza()
-        else:
-            pizza = None
-
-        return pizza
+    pass
 
 
 class CAPizzaStore(PizzaStore):
-    def create_pizza(self, type: str) -> Pizza:
-        pizza: Pizza
-        if type == "cheese":
-            pizza = CAStyleCheesePizza()
-        elif type == "veggie":
-            pizza = CAStyleVeggiePizza()
-        elif type == "clam":
-            pizza = CAStyleClamPizza()
-        elif type == "pepperoni":
-            pizza = CAStylePepperoniPizza()
-        else:
-            pizza = None
-
-        return pizza
+    pass
 
 
 class ChicagoPizzaStore(PizzaStore):
-    def create_pizza(self, type: str) -> Pizza:
-        pizza: Pizza
-        if type == "cheese":
-            pizza = ChicagoStyleCheesePizza()
-        elif type == "veggie":
-            pizza = ChicagoStyleVeggiePizza()
-        elif type == "clam":
-            pizza = ChicagoStyleClamPizza()
-        elif type == "pepperoni":
-            pizza = ChicagoStylePepperoniPizza()
-        else:
-            pizza = None
-
-        return pizza
+    pass
 
 
 # Ingredients
@@ -177,7 +335,7 @@ class PizzaIngredientFactory(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def create_veggies(self) -> List[Veggies]:
+    def create_veggies(self) -> Tuple[Veggies, ...]:
         raise NotImplementedError
 
     @abstractmethod
@@ -190,6 +348,9 @@ class PizzaIngredientFactory(ABC):
 
 
 class NYPizzaIngredientFactory(PizzaIngredientFactory):
+    # Shared by every pizza; a tuple so no pizza can change another's veggies
+    VEGGIES: Tuple[Veggies, ...] = (Garlic(), Onion(), Mushroom(), RedPepper())
+
     def create_dough(self) -> Dough:
         return ThinCrustDough()
 
@@ -199,9 +360,8 @@ class NYPizzaIngredientFactory(PizzaIngredientFactory):
     def create_cheese(self) -> Cheese:
         return ReggianoCheese()
 
-    def create_veggies(self) -> List[Veggies]:
-        veggies: List[Veggies] = [Garlic(), Onion(), Mushroom(), RedPepper()]
-        return veggies
+    def create_veggies(self) -> Tuple[Veggies, ...]:
+        return self.VEGGIES
 
     def create_pepperoni(self) -> Pepperoni:
         return SlicedPepperoni()
@@ -211,6 +371,8 @@ class NYPizzaIngredientFactory(PizzaIngredientFactory):
 
 
 class ChicagoPizzaIngredientFactory(PizzaIngredientFactory):
+    VEGGIES: Tuple[Veggies, ...] = (Spinach(), BlackOlives(), Eggplant())
+
     def create_dough(self) -> Dough:
         return ThickCrustDough()
 
@@ -220,9 +382,8 @@ class ChicagoPizzaIngredientFactory(PizzaIngredientFactory):
     def create_cheese(self) -> Cheese:
         return MozzarellaCheese()
 
-    def create_veggies(self) -> List[Veggies]:
-        veggies: List[Veggies] = [Spinach(), BlackOlives(), Eggplant()]
-        return veggies
+    def create_veggies(self) -> Tuple[Veggies, ...]:
+        return self.VEGGIES
 
     def create_pepperoni(self) -> Pepperoni:
         return SlicedPepperoni()
@@ -231,6 +392,50 @@ class ChicagoPizzaIngredientFactory(PizzaIngredientFactory):
         return FrozenClams()
 
 
+# Menus
+
+NYPizzaStore.register(
+    "cheese", CheesePizza, "New York Style Cheese Pizza", NYPizzaIngredientFactory
+)
+NYPizzaStore.register(
+    "veggie", VeggiePizza, "New York Style Veggie Pizza", NYPizzaIngredientFactory
+)
+NYPizzaStore.register(
+    "clam", ClamPizza, "New York Style Clam Pizza", NYPizzaIngredientFactory
+)
+NYPizzaStore.register(
+    "pepperoni",
+    PepperoniPizza,
+    "New York Style Pepperoni Pizza",
+    NYPizzaIngredientFactory,
+)
+
+ChicagoPizzaStore.register(
+    "cheese",
+    ChicagoStyleCheesePizza,
+    "Chicago Style Deep Dish Cheese Pizza",
+    ChicagoPizzaIngredientFactory,
+)
+ChicagoPizzaStore.register(
+    "veggie",
+    ChicagoStyleVeggiePizza,
+    "Chicago Style Veggie Pizza",
+    ChicagoPizzaIngredientFactory,
+)
+ChicagoPizzaStore.register(
+    "clam",
+    ChicagoStyleClamPizza,
+    "Chicago Style Clam Pizza",
+    ChicagoPizzaIngredientFactory,
+)
+ChicagoPizzaStore.register(
+    "pepperoni",
+    ChicagoStylePepperoniPizza,
+    "Chicago Style Pepperoni Pizza",
+    ChicagoPizzaIngredientFactory,
+)
+
+
 if __name__ == "__main__":
     ny_store: PizzaStore = NYPizzaStore()
     ch_store: PizzaStore = ChicagoPizzaStore()